@@ -6,6 +6,6 @@ from slangpy.bindings.marshall import Marshall, BindContext, ReturnContext
 from slangpy.bindings.boundvariable import BoundVariable, BoundCall, BoundVariableException
 from slangpy.bindings.boundvariableruntime import BoundVariableRuntime, BoundCallRuntime
 from slangpy.bindings.codegen import CodeGen, CodeGenBlock
-from slangpy.bindings.typeregistry import PYTHON_TYPES, PYTHON_SIGNATURES, get_or_create_type
+from slangpy.bindings.typeregistry import PYTHON_TYPES, PYTHON_SIGNATURES, get_or_create_type, get_or_create_shared_marshall
 
 from slangpy.core.native import AccessType, CallContext, Shape
@@ -1,5 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
-from typing import Any, Optional, Union
+from itertools import chain
+from typing import Any, Iterator, Optional, Union
 
 from slangpy.core.enums import IOType
 from slangpy.core.native import AccessType, CallMode, Shape
@@ -10,6 +11,103 @@ from slangpy.bindings.codegen import CodeGen
 from slangpy.bindings.typeregistry import get_or_create_type
 from slangpy.reflection import (SlangField, SlangFunction, SlangParameter,
                                 SlangType)
+from slangpy.reflection.reflectiontypes import io_type_from_modifiers
+
+
+_NO_ACCESS = (AccessType.none, AccessType.none)
+
+#: Primal and derivative access for each (call mode, differentiable, io type). Any
+#: combination not listed (currently all forward mode calls) has no access.
+_ACCESS_TABLE: dict[tuple[CallMode, bool, IOType], tuple[AccessType, AccessType]] = {
+    (CallMode.prim, True, IOType.inout): (AccessType.readwrite, AccessType.none),
+    (CallMode.prim, True, IOType.out): (AccessType.write, AccessType.none),
+    (CallMode.prim, True, IOType.inn): (AccessType.read, AccessType.none),
+    (CallMode.prim, False, IOType.inout): (AccessType.readwrite, AccessType.none),
+    (CallMode.prim, False, IOType.out): (AccessType.write, AccessType.none),
+    (CallMode.prim, False, IOType.inn): (AccessType.read, AccessType.none),
+    (CallMode.bwds, True, IOType.inout): (AccessType.read, AccessType.readwrite),
+    (CallMode.bwds, True, IOType.out): (AccessType.none, AccessType.read),
+    (CallMode.bwds, True, IOType.inn): (AccessType.read, AccessType.write),
+    (CallMode.bwds, False, IOType.inout): (AccessType.read, AccessType.none),
+    (CallMode.bwds, False, IOType.out): _NO_ACCESS,
+    (CallMode.bwds, False, IOType.inn): (AccessType.read, AccessType.none),
+}
+
+
+_IO_MODIFIERS = {IOType.none: "", IOType.inn: "in ", IOType.out: "out ", IOType.inout: "inout "}
+
+#: Trampoline argument prefixes, keyed by (io type, whether the argument is no_diff).
+_TRAMPOLINE_PREFIXES: dict[tuple[IOType, bool], str] = {
+    (io_type, no_diff): ("no_diff " if no_diff else "") + modifier
+    for io_type, modifier in _IO_MODIFIERS.items() for no_diff in (False, True)
+}
+
+
+#: Vector mapping constant declarations, keyed by mapping, with a placeholder for
+#: the variable name. Mappings repeat heavily across arguments and kernels.
+_MAPPING_DECLARATIONS: dict[tuple[int, ...], str] = {}
+
+
+def _mapping_declaration(mapping: tuple[int, ...]) -> str:
+    decl = _MAPPING_DECLARATIONS.get(mapping)
+    if decl is None:
+        if len(mapping) > 0:
+            values = ','.join(map(str, mapping))
+            decl = f"static const int[] _m_{{name}} = {{{{ {values} }}}}"
+        else:
+            decl = "static const int _m_{name} = 0"
+        _MAPPING_DECLARATIONS[mapping] = decl
+    return decl
+
+
+def _mapped_context(name: str, mapping: tuple[int, ...], call_dimensionality: Optional[int]) -> str:
+    """
+    Get the expression that maps a call context to a variable's dimensions. When the
+    mapping is the identity the context is passed through unchanged.
+    """
+    if call_dimensionality is not None and mapping == tuple(range(call_dimensionality)):
+        return "context"
+    return f"context.map(_m_{name})"
+
+
+#: Default vector mappings, keyed by (variable dimensionality, call dimensionality).
+_DEFAULT_MAPPINGS: dict[tuple[int, int], Shape] = {}
+
+
+def _default_mapping(dimensionality: int, call_dimensionality: int) -> Shape:
+    """
+    Get the default mapping of a variable's dimensions to the trailing call dimensions.
+    """
+    key = (dimensionality, call_dimensionality)
+    mapping = _DEFAULT_MAPPINGS.get(key)
+    if mapping is None:
+        mapping = Shape(*range(call_dimensionality - dimensionality, call_dimensionality))
+        _DEFAULT_MAPPINGS[key] = mapping
+    return mapping
+
+
+def _struct_call_data_body(indent: str, type_name: str, call_dimensionality: Optional[int],
+                           differentiable: bool, writes: bool, members: tuple[tuple[str, str, str], ...]) -> str:
+    """
+    Get the member declarations and load/store methods of a struct call data type,
+    excluding its opening line and closing brace.
+    """
+    inner = indent + "    "
+    prefix = "[Differentiable]" if differentiable else ""
+    lines = [f"{indent}_t_{var} {var};\n" for _, var, _ in members]
+
+    methods = [("load", "out")]
+    if writes:
+        methods.append(("store", "in"))
+    for method, modifier in methods:
+        lines.append("\n")
+        lines.append(f"{indent}{prefix} void {method}(ContextND<{call_dimensionality}> context, "
+                     f"{modifier} {type_name} value)\n")
+        lines.append(f"{indent}{{\n")
+        lines.extend(f"{inner}{var}.{method}({mapped},value.{field});\n"
+                     for field, var, mapped in members)
+        lines.append(f"{indent}}}\n")
+    return "".join(lines)
 
 
 class BoundVariableException(Exception):
@@ -31,11 +129,44 @@ class BoundCall:
     later bound to corresponding slang parameters during function resolution.
     """
 
+    __slots__ = ('args', 'kwargs', 'slang')
+
     def __init__(self, context: 'BindContext', *args: Any, **kwargs: Any):
         super().__init__()
         self.args = [BoundVariable(context, x, None, "") for x in args]
         self.kwargs = {n: BoundVariable(context, v, None, n) for n, v in kwargs.items()}
 
+    @classmethod
+    def from_args_with_mapping(cls, context: 'BindContext', args: tuple[Any, ...], kwargs: dict[str, Any],
+                               map_args: tuple[Any, ...], map_kwargs: dict[str, Any]) -> 'BoundCall':
+        """
+        Construct a call from python arguments, applying explicit vectorization
+        provided via function.map() to each variable as it is created. This
+        calculates the vector type and mapping of each explicitly mapped argument.
+        """
+        if len(map_args) > len(args):
+            raise ValueError("Too many arguments supplied for explicit vectorization")
+        if len(map_kwargs) > len(kwargs):
+            raise ValueError(
+                "Too many keyword arguments supplied for explicit vectorization")
+        for name in map_kwargs:
+            if not name in kwargs:
+                raise ValueError(f"Unknown keyword argument {name}")
+
+        call = cls(context)
+        num_mapped = len(map_args)
+        for i, x in enumerate(args):
+            arg = BoundVariable(context, x, None, "")
+            if i < num_mapped:
+                arg.apply_explicit_vectorization(context, map_args[i])
+            call.args.append(arg)
+        for n, v in kwargs.items():
+            arg = BoundVariable(context, v, None, n)
+            if n in map_kwargs:
+                arg.apply_explicit_vectorization(context, map_kwargs[n])
+            call.kwargs[n] = arg
+        return call
+
     def bind(self, slang: SlangFunction):
         """
         Stores slang function this call is bound to.
@@ -87,56 +218,34 @@ class BoundCall:
         """
         return any(not x.vector_mapping.valid for x in self.args)
 
-    def apply_explicit_vectorization(self, context: 'BindContext', args: tuple[Any, ...], kwargs: dict[str, Any]):
-        """
-        Calls apply_explicit_vectorization on all arguments, which calculates
-        the vector type and mapping for each argument based on explicitly
-        provided information via function.map().
-        """
-
-        if len(args) > len(self.args):
-            raise ValueError("Too many arguments supplied for explicit vectorization")
-        if len(kwargs) > len(self.kwargs):
-            raise ValueError(
-                "Too many keyword arguments supplied for explicit vectorization")
-
-        for i, arg in enumerate(args):
-            self.args[i].apply_explicit_vectorization(context, arg)
-
-        for name, arg in kwargs.items():
-            if not name in self.kwargs:
-                raise ValueError(f"Unknown keyword argument {name}")
-            self.kwargs[name].apply_explicit_vectorization(context, arg)
-
     def values(self) -> list['BoundVariable']:
         """
         Return list of all bound variables in the call.
         """
         return self.args + list(self.kwargs.values())
 
+    def iter_values(self) -> Iterator['BoundVariable']:
+        """
+        Iterate all bound variables in the call without building a list.
+        """
+        return chain(self.args, self.kwargs.values())
+
     def apply_implicit_vectorization(self, context: BindContext):
         """
         Calls apply_implicit_vectorization on all arguments, which attempts
         to calculate any remaining vector types once binding to
         a slang function is complete.
         """
-
-        for arg in self.args:
-            arg.apply_implicit_vectorization(context)
-
-        for arg in self.kwargs.values():
+        for arg in self.iter_values():
             arg.apply_implicit_vectorization(context)
 
-    def finalize_mappings(self, context: BindContext):
+    def finalize(self, context: BindContext):
         """
-        Calls finalize_mappings on all arguments, which ensures all vector
-        mappings are valid and consistent.
+        Calls finalize on all arguments, which finalizes vector mappings and
+        calculates differentiability in a single pass.
         """
-        for arg in self.args:
-            arg.finalize_mappings(context)
-
-        for arg in self.kwargs.values():
-            arg.finalize_mappings(context)
+        for arg in self.iter_values():
+            arg.finalize(context)
 
 
 class BoundVariable:
@@ -145,6 +254,10 @@ class BoundVariable:
     and a potential set of child nodes for use during kernel generation.
     """
 
+    __slots__ = ('name', 'variable_name', 'python', 'access', 'differentiable', 'call_dimensionality',
+                 'param_index', 'vector_mapping', 'vector_type', 'explicitly_vectorized', 'slang_type',
+                 'slang_modifiers', 'io_type', 'no_diff', 'path', 'children')
+
     def __init__(self,
                  context: 'BindContext',
                  value: Any,
@@ -187,6 +300,12 @@ class BoundVariable:
         #: Slang type this variable is bound to.
         self.slang_type: Optional[SlangType] = None
 
+        #: IO type (in/inout/out) of this variable, resolved from slang modifiers on bind.
+        self.io_type = IOType.inn
+
+        #: Whether this variable is marked as no_diff, resolved from slang modifiers on bind.
+        self.no_diff = False
+
         # Initialize path
         if parent is None:
             # Path relative to root.
@@ -216,10 +335,19 @@ class BoundVariable:
                 self.name = self.name
             self.slang_type = slang
             self.slang_modifiers = modifiers
+            self.io_type, self.no_diff = io_type_from_modifiers(modifiers)
         else:
             self.name = slang.name
             self.slang_type = slang.type
-            self.slang_modifiers = modifiers.union(slang.modifiers)
+            if modifiers:
+                self.slang_modifiers = modifiers.union(slang.modifiers)
+                self.io_type, self.no_diff = io_type_from_modifiers(self.slang_modifiers)
+            else:
+                # Nothing inherited (e.g. a root parameter), so the variable's own
+                # precomputed io type and no_diff apply directly.
+                self.slang_modifiers = slang.modifiers
+                self.io_type = slang.io_type
+                self.no_diff = slang.no_diff
         self.variable_name = self.name
 
         if self.children is not None:
@@ -230,30 +358,6 @@ class BoundVariable:
                 slang_child = self.slang_type.fields[child.name]
                 child.bind(slang_child, self.slang_modifiers)
 
-    @property
-    def io_type(self) -> IOType:
-        """
-        Returns the IO type of this variable based on slang modifiers.
-        """
-
-        have_in = ModifierID.inn in self.slang_modifiers
-        have_out = ModifierID.out in self.slang_modifiers
-        have_inout = ModifierID.inout in self.slang_modifiers
-
-        if (have_in and have_out) or have_inout:
-            return IOType.inout
-        elif have_out:
-            return IOType.out
-        else:
-            return IOType.inn
-
-    @property
-    def no_diff(self) -> bool:
-        """
-        Returns whether this variable is marked as no_diff.
-        """
-        return ModifierID.nodiff in self.slang_modifiers
-
     def apply_explicit_vectorization(self, context: 'BindContext', mapping: Any):
         """
         Apply explicit vectorization to this variable and children.
@@ -364,15 +468,6 @@ class BoundVariable:
                 raise BoundVariableException(
                     f"Could not resolve dimensionality for {self.path}", self)
 
-    def finalize_mappings(self, context: BindContext):
-        """
-        Finalize vector mappings and types for this variable and children.
-        """
-        if self.children is not None:
-            for child in self.children.values():
-                child.finalize_mappings(context)
-        self._finalize_mappings(context)
-
     def _finalize_mappings(self, context: BindContext):
         if self.call_dimensionality == -1:
             self.call_dimensionality = context.call_dimensionality
@@ -384,43 +479,40 @@ class BoundVariable:
 
         if not self.vector_mapping.valid:
             assert self.call_dimensionality is not None
-            m: list[int] = []
-            for i in range(self.call_dimensionality):
-                m.append(context.call_dimensionality - i - 1)
-            m.reverse()
-            self.vector_mapping = Shape(*m)
+            self.vector_mapping = _default_mapping(
+                self.call_dimensionality, context.call_dimensionality)
 
-    def calculate_differentiability(self, context: BindContext):
+    def finalize(self, context: BindContext):
         """
-        Recursively calculate  differentiability
+        Finalize vector mappings and calculate differentiability for this variable
+        and children in a single walk. Neither depends on other variables.
         """
+        if self.children is not None:
+            for child in self.children.values():
+                child.finalize(context)
+        self._finalize_mappings(context)
+        self._calculate_node_differentiability(context)
 
+    def _calculate_node_differentiability(self, context: BindContext):
         # Can now decide if differentiable
         assert self.vector_type is not None
         self.differentiable = not self.no_diff and self.vector_type.differentiable and self.python.has_derivative
         self._calculate_differentiability(context.call_mode)
 
-        if self.children is not None:
-            for child in self.children.values():
-                child.calculate_differentiability(context)
-
     def get_input_list(self, args: list['BoundVariable']):
         """
-        Recursively populate flat list of argument nodes
+        Populate flat list of leaf argument nodes, in depth first order
         """
-        self._get_input_list_recurse(args)
+        stack: list[BoundVariable] = [self]
+        while stack:
+            node = stack.pop()
+            if node.children is None:
+                args.append(node)
+            else:
+                # Push in reverse so children are visited in declaration order
+                stack.extend(reversed(node.children.values()))
         return args
 
-    def _get_input_list_recurse(self, args: list['BoundVariable']):
-        """
-        Internal recursive function to populate flat list of argument nodes
-        """
-        if self.children is not None:
-            for child in self.children.values():
-                child._get_input_list_recurse(args)
-        else:
-            args.append(self)
-
     def __repr__(self):
         return self.python.__repr__()
 
@@ -428,39 +520,7 @@ class BoundVariable:
         """
         Calculates access types based on differentiability, call mode and io type
         """
-        if mode == CallMode.prim:
-            if self.differentiable:
-                if self.io_type == IOType.inout:
-                    self.access = (AccessType.readwrite, AccessType.none)
-                elif self.io_type == IOType.out:
-                    self.access = (AccessType.write, AccessType.none)
-                else:
-                    self.access = (AccessType.read, AccessType.none)
-            else:
-                if self.io_type == IOType.inout:
-                    self.access = (AccessType.readwrite, AccessType.none)
-                elif self.io_type == IOType.out:
-                    self.access = (AccessType.write, AccessType.none)
-                else:
-                    self.access = (AccessType.read, AccessType.none)
-        elif mode == CallMode.bwds:
-            if self.differentiable:
-                if self.io_type == IOType.inout:
-                    self.access = (AccessType.read, AccessType.readwrite)
-                elif self.io_type == IOType.out:
-                    self.access = (AccessType.none, AccessType.read)
-                else:
-                    self.access = (AccessType.read, AccessType.write)
-            else:
-                if self.io_type == IOType.inout:
-                    self.access = (AccessType.read, AccessType.none)
-                elif self.io_type == IOType.out:
-                    self.access = (AccessType.none, AccessType.none)
-                else:
-                    self.access = (AccessType.read, AccessType.none)
-        else:
-            # todo: fwds
-            self.access = (AccessType.none, AccessType.none)
+        self.access = _ACCESS_TABLE.get((mode, self.differentiable, self.io_type), _NO_ACCESS)
 
     def gen_call_data_code(self, cg: CodeGen, context: BindContext, depth: int = 0):
         if self.children is not None:
@@ -471,30 +531,13 @@ class BoundVariable:
             for field, variable in self.children.items():
                 variable.gen_call_data_code(cg, context, depth+1)
 
-            for var in self.children.values():
-                cgb.declare(f"_t_{var.variable_name}", var.variable_name)
-
             assert self.vector_type is not None
-            context_decl = f"ContextND<{self.call_dimensionality}> context"
-            value_decl = f"{self.vector_type.full_name} value"
-            prefix = "[Differentiable]" if self.access[1] != AccessType.none else ""
-
-            cgb.empty_line()
-            cgb.append_line(f"{prefix} void load({context_decl}, out {value_decl})")
-            cgb.begin_block()
-            for field, var in self.children.items():
-                cgb.append_statement(
-                    f"{var.variable_name}.load(context.map(_m_{var.variable_name}),value.{field})")
-            cgb.end_block()
-
-            if self.access[0] in (AccessType.write, AccessType.readwrite):
-                cgb.empty_line()
-                cgb.append_line(f"{prefix} void store({context_decl}, in {value_decl})")
-                cgb.begin_block()
-                for field, var in self.children.items():
-                    cgb.append_statement(
-                        f"{var.variable_name}.store(context.map(_m_{var.variable_name}),value.{field})")
-                cgb.end_block()
+            cgb.append_code(_struct_call_data_body(
+                cgb.indent, self.vector_type.full_name, self.call_dimensionality,
+                self.access[1] != AccessType.none,
+                self.access[0] in (AccessType.write, AccessType.readwrite),
+                tuple((field, var.variable_name, var.mapped_context(self.call_dimensionality))
+                      for field, var in self.children.items())))
 
             cgb.end_struct()
 
@@ -502,28 +545,23 @@ class BoundVariable:
             # Generate call data
             self.python.gen_calldata(cg.call_data_structs, context, self)
 
-        if len(self.vector_mapping) > 0:
-            cg.call_data_structs.append_statement(
-                f"static const int[] _m_{self.variable_name} = {{ {','.join([str(x) for x in self.vector_mapping.as_tuple()])} }}")
-        else:
-            cg.call_data_structs.append_statement(
-                f"static const int _m_{self.variable_name} = 0")
+        cg.call_data_structs.append_statement(
+            _mapping_declaration(self.vector_mapping.as_tuple()).format(name=self.variable_name))
 
         if depth == 0:
             cg.call_data.declare(f"_t_{self.variable_name}", self.variable_name)
 
+    def mapped_context(self, call_dimensionality: Optional[int]) -> str:
+        """
+        Get the expression passed to this variable's load/store methods, given
+        the dimensionality of the context being mapped from.
+        """
+        return _mapped_context(self.variable_name, self.vector_mapping.as_tuple(), call_dimensionality)
+
     def _gen_trampoline_argument(self):
         assert self.vector_type is not None
-        arg_def = f"{self.vector_type.full_name} {self.variable_name}"
-        if self.io_type == IOType.inout:
-            arg_def = f"inout {arg_def}"
-        elif self.io_type == IOType.out:
-            arg_def = f"out {arg_def}"
-        elif self.io_type == IOType.inn:
-            arg_def = f"in {arg_def}"
-        if self.no_diff or not self.differentiable:
-            arg_def = f"no_diff {arg_def}"
-        return arg_def
+        prefix = _TRAMPOLINE_PREFIXES[(self.io_type, self.no_diff or not self.differentiable)]
+        return f"{prefix}{self.vector_type.full_name} {self.variable_name}"
 
     def __str__(self) -> str:
         return self._recurse_str(0)
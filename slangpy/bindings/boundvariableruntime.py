@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 from typing import TYPE_CHECKING
 
-from slangpy.core.native import (NativeBoundCallRuntime,
+from slangpy.core.native import (AccessType, NativeBoundCallRuntime,
                                  NativeBoundVariableRuntime, Shape)
 
 if TYPE_CHECKING:
@@ -39,6 +39,11 @@ class BoundVariableRuntime(NativeBoundVariableRuntime):
         #: Access type (in/out/inout).
         self.access = source.access
 
+        #: Whether the kernel writes to the primal, and so needs writable call
+        #: data and a read back after dispatch. Fixed once bound, so computed
+        #: here rather than per call.
+        self.writes_primal = source.access[0] in (AccessType.write, AccessType.readwrite)
+
         #: Mapping of dimensions.
         self.transform = source.vector_mapping
 
@@ -50,9 +50,7 @@ class CodeGenBlock:
         self.code.append(code)
 
     def append_code_indented(self, code: str):
-        lines = code.splitlines()
-        for line in lines:
-            self.append_line(line)
+        self.extend_lines(code.splitlines())
 
     def empty_line(self):
         self.append_code("\n")
@@ -67,6 +65,14 @@ class CodeGenBlock:
         self.append_code(func_line)
         self.append_code(";\n")
 
+    def extend_lines(self, lines: list[str]):
+        """
+        Append several lines at the current indent in one go.
+        """
+        if lines:
+            indent = self.indent
+            self.code.append(indent + f"\n{indent}".join(lines) + "\n")
+
     def begin_block(self):
         self.append_line("{")
         self.inc_indent()
@@ -186,34 +192,34 @@ class CodeGen:
 
         all_code: list[str] = []
         if header:
-            all_code = [self.header] + all_code
+            all_code.append(self.header)
             all_code.append("\n")
         if imports:
-            all_code = all_code + [f'import "{x}";\n' for x in self.imports]
+            all_code.extend(f'import "{x}";\n' for x in self.imports)
             all_code.append("\n")
         if constants:
-            all_code = all_code + self.constants.code
+            all_code.extend(self.constants.code)
             all_code.append("\n")
         if context:
-            all_code = all_code + self.context.code
+            all_code.extend(self.context.code)
             all_code.append("\n")
         if call_data_structs:
-            all_code = all_code + self.call_data_structs.code
+            all_code.extend(self.call_data_structs.code)
             all_code.append("\n")
         if call_data:
-            all_code = all_code + self.call_data.code
+            all_code.extend(self.call_data.code)
             all_code.append("\n")
         if snippets:
-            all_code = all_code + list(self.snippets.values())
+            all_code.extend(self.snippets.values())
             all_code.append("\n")
         if input_load_store:
-            all_code = all_code + self.input_load_store.code
+            all_code.extend(self.input_load_store.code)
             all_code.append("\n")
         if trampoline:
-            all_code = all_code + self.trampoline.code
+            all_code.extend(self.trampoline.code)
             all_code.append("\n")
         if kernel:
-            all_code = all_code + self.kernel.code
+            all_code.extend(self.kernel.code)
             all_code.append("\n")
 
         return "".join(all_code)
@@ -1,11 +1,13 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
-from typing import TYPE_CHECKING, Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
 
 from slangpy.bindings.marshall import Marshall
 
 if TYPE_CHECKING:
     from slangpy.reflection import SlangProgramLayout
 
+TMarshall = TypeVar('TMarshall', bound=Marshall)
+
 TTypeLookup = Callable[['SlangProgramLayout', Any], Marshall]
 
 #: Dictionary of python types to function that allocates a corresponding type
@@ -33,3 +35,19 @@ def get_or_create_type(layout: 'SlangProgramLayout', python_type: Any, value: An
         return python_type
     else:
         raise ValueError(f"Unsupported type {python_type}")
+
+
+def get_or_create_shared_marshall(layout: 'SlangProgramLayout', marshall_type: type[TMarshall], *args: Any) -> TMarshall:
+    """
+    Get a marshall of the given type shared by all values in a layout that construct
+    it with the same arguments, constructing it as marshall_type(layout, *args) on
+    first use. Marshalls are stored on the layout and discarded when it is hot
+    reloaded. Only suitable for marshalls that are immutable once constructed.
+    """
+    marshalls = layout._shared_marshalls
+    key = (marshall_type, *args)
+    marshall = marshalls.get(key)
+    if marshall is None:
+        marshall = marshall_type(layout, *args)  # type: ignore
+        marshalls[key] = marshall
+    return marshall  # type: ignore
@@ -3,7 +3,7 @@ from typing import Any, Optional
 
 import numpy as np
 
-from slangpy.core.enums import PrimType
+from slangpy.core.enums import PRIM_TYPE_ITEMS, PrimType
 from slangpy.core.native import AccessType, CallContext
 
 import slangpy.reflection as kfr
@@ -130,9 +130,8 @@ class DiffPairMarshall(Marshall):
         access = binding.access
         res = {}
 
-        for prim in PrimType:
-            prim_name = prim.name
-            prim_access = access[prim.value]
+        for prim, prim_index, prim_name in PRIM_TYPE_ITEMS:
+            prim_access = access[prim_index]
             prim_data = data.get(prim)
             prim_type = self.get_type(prim)
             if prim_access in [AccessType.write, AccessType.readwrite]:
@@ -151,9 +150,8 @@ class DiffPairMarshall(Marshall):
 
     def read_calldata(self, context: CallContext, binding: 'BoundVariableRuntime', data: DiffPair, result: Any) -> None:
         access = binding.access
-        for prim in PrimType:
-            prim_name = prim.name
-            prim_access = access[prim.value]
+        for prim, prim_index, prim_name in PRIM_TYPE_ITEMS:
+            prim_access = access[prim_index]
             prim_type = self.get_type(prim)
             if prim_access in [AccessType.write, AccessType.readwrite]:
                 assert isinstance(result[prim_name]['value'], Buffer)
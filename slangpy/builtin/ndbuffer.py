@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 from typing import Any, Optional, cast
 
-from slangpy.core.enums import PrimType
+from slangpy.core.enums import PRIM_TYPE_ITEMS, PrimType
 from slangpy.core.native import AccessType, CallContext, Shape, CallMode, NativeNDBuffer, NativeNDBufferMarshall
 
 from slangpy.backend import ResourceUsage, TypeReflection
@@ -296,18 +296,20 @@ class NDDifferentiableBufferMarshall(BaseNDBufferMarshall):
             broadcast = _calc_broadcast(context, binding)
             access = binding.access
             assert binding.transform is not None
+
+            # Primal and derivative share the same shape and (broadcast) strides.
+            strides = [0 if is_broadcast else stride for stride, is_broadcast in zip(data.strides, broadcast)]
+            shape = data.shape.as_tuple()
+
             res = {}
-            for prim in PrimType:
-                prim_name = prim.name
-                prim_access = access[prim.value]
-                if prim_access != AccessType.none:
+            for prim, prim_index, prim_name in PRIM_TYPE_ITEMS:
+                if access[prim_index] != AccessType.none:
                     ndbuffer = data if prim == PrimType.primal else data.grad
                     assert ndbuffer is not None
-                    value = ndbuffer.storage if prim == PrimType.primal else ndbuffer.storage
                     res[prim_name] = {
-                        'buffer': value,
-                        'strides': [data.strides[i] if not broadcast[i] else 0 for i in range(len(data.strides))],
-                        'shape': data.shape.as_tuple()
+                        'buffer': ndbuffer.storage,
+                        'strides': strides,
+                        'shape': shape
                     }
             return res
 
@@ -6,7 +6,17 @@ from slangpy.reflection import SlangProgramLayout, SlangType, StructuredBufferTy
 from slangpy.backend import Buffer, ResourceUsage
 from slangpy.bindings import (PYTHON_SIGNATURES, PYTHON_TYPES,
                               BindContext, BoundVariable,
-                              CodeGenBlock)
+                              CodeGenBlock, get_or_create_shared_marshall)
+
+
+# Call data type alias for each (buffer type, writable) pair. Only structured buffer
+# templates need formatting with the element type.
+_ALIAS_TEMPLATES = {
+    (StructuredBufferType, True): "RWStructuredBufferType<{elem}>",
+    (StructuredBufferType, False): "StructuredBufferType<{elem}>",
+    (ByteAddressBufferType, True): "RWByteAddressBufferType",
+    (ByteAddressBufferType, False): "ByteAddressBufferType",
+}
 
 
 class BufferMarshall(NativeBufferMarshall):
@@ -37,28 +47,19 @@ class BufferMarshall(NativeBufferMarshall):
 
     # Call data can only be read access to primal, and simply declares it as a variable
     def gen_calldata(self, cgb: CodeGenBlock, context: BindContext, binding: 'BoundVariable'):
-        access = binding.access[0]
+        # Access is only inspected by the assert, so costs nothing when run with -O.
+        assert binding.access[0] == AccessType.read
         name = binding.variable_name
-        assert access == AccessType.read
-
-        if isinstance(binding.vector_type, StructuredBufferType):
-            assert binding.vector_type.element_type is not None
-            if binding.vector_type.writable:
-                cgb.type_alias(
-                    f"_t_{name}", f"RWStructuredBufferType<{binding.vector_type.element_type.full_name}>")
-            else:
-                cgb.type_alias(
-                    f"_t_{name}", f"StructuredBufferType<{binding.vector_type.element_type.full_name}>")
-        elif isinstance(binding.vector_type, ByteAddressBufferType):
-            if binding.vector_type.writable:
-                cgb.type_alias(
-                    f"_t_{name}", f"RWByteAddressBufferType")
-            else:
-                cgb.type_alias(
-                    f"_t_{name}", f"ByteAddressBufferType")
-        else:
+
+        vector_type = binding.vector_type
+        template = _ALIAS_TEMPLATES.get((type(vector_type), getattr(vector_type, 'writable', None)))
+        if template is None:
             raise ValueError(
                 "Raw buffers can not be vectorized. If you need vectorized buffers, see the NDBuffer slangpy type")
+        if isinstance(vector_type, StructuredBufferType):
+            assert vector_type.element_type is not None
+            template = template.format(elem=vector_type.element_type.full_name)
+        cgb.type_alias(f"_t_{name}", template)
 
     @property
     def is_writable(self) -> bool:
@@ -73,12 +74,28 @@ class BufferMarshall(NativeBufferMarshall):
 def _get_or_create_python_type(layout: SlangProgramLayout, value: Buffer):
     if isinstance(value, Buffer):
         usage = value.desc.usage
-        return BufferMarshall(layout, usage)
     else:
         # Handle user trying to pass types like torch tensors in to a structured buffer arg
-        return BufferMarshall(layout, ResourceUsage.shader_resource | ResourceUsage.unordered_access)
+        usage = ResourceUsage.shader_resource | ResourceUsage.unordered_access
+
+    # Buffer marshalls are immutable once created, so are shared per layout and usage.
+    return get_or_create_shared_marshall(layout, BufferMarshall, usage)
 
 
 PYTHON_TYPES[Buffer] = _get_or_create_python_type
 
-PYTHON_SIGNATURES[Buffer] = lambda x: f"[{x.desc.usage}]"
+# Signature strings per usage, so the usage enum is only formatted once.
+_USAGE_SIGNATURES: dict[int, str] = {}
+
+
+def _get_signature(value: Buffer) -> str:
+    usage = value.desc.usage
+    key = int(usage)
+    sig = _USAGE_SIGNATURES.get(key)
+    if sig is None:
+        sig = f"[{usage}]"
+        _USAGE_SIGNATURES[key] = sig
+    return sig
+
+
+PYTHON_SIGNATURES[Buffer] = _get_signature
@@ -9,7 +9,7 @@ import slangpy.reflection as kfr
 from slangpy.backend import math
 from slangpy.bindings import (PYTHON_SIGNATURES, PYTHON_TYPES,
                               BindContext, BoundVariable, BoundVariableRuntime,
-                              CodeGenBlock)
+                              CodeGenBlock, get_or_create_shared_marshall)
 from slangpy.reflection.reflectiontypes import (BOOL_TYPES, FLOAT_TYPES,
                                                 INT_TYPES, SIGNED_INT_TYPES,
                                                 UNSIGNED_INT_TYPES, SlangType)
@@ -249,13 +249,14 @@ class MatrixMarshall(ValueMarshall):
 
 
 # Point built in python types at their slang equivalents
-PYTHON_TYPES[type(None)] = lambda layout, pytype: NoneMarshall(layout)
-PYTHON_TYPES[bool] = lambda layout, pytype: ScalarMarshall(
-    layout, TypeReflection.ScalarType.bool)
-PYTHON_TYPES[float] = lambda layout, pytype: ScalarMarshall(
-    layout, TypeReflection.ScalarType.float32)
-PYTHON_TYPES[int] = lambda layout, pytype: ScalarMarshall(
-    layout, TypeReflection.ScalarType.int32)
+PYTHON_TYPES[type(None)] = lambda layout, pytype: get_or_create_shared_marshall(
+    layout, NoneMarshall)
+PYTHON_TYPES[bool] = lambda layout, pytype: get_or_create_shared_marshall(
+    layout, ScalarMarshall, TypeReflection.ScalarType.bool)
+PYTHON_TYPES[float] = lambda layout, pytype: get_or_create_shared_marshall(
+    layout, ScalarMarshall, TypeReflection.ScalarType.float32)
+PYTHON_TYPES[int] = lambda layout, pytype: get_or_create_shared_marshall(
+    layout, ScalarMarshall, TypeReflection.ScalarType.int32)
 PYTHON_SIGNATURES[type(None)] = None
 PYTHON_SIGNATURES[bool] = None
 PYTHON_SIGNATURES[float] = None
@@ -263,8 +264,8 @@ PYTHON_SIGNATURES[int] = None
 
 
 # Python quaternion type
-PYTHON_TYPES[math.quatf] = lambda layout, pytype: VectorMarshall(
-    layout, TypeReflection.ScalarType.float32, 4)
+PYTHON_TYPES[math.quatf] = lambda layout, pytype: get_or_create_shared_marshall(
+    layout, VectorMarshall, TypeReflection.ScalarType.float32, 4)
 PYTHON_SIGNATURES[math.quatf] = None
 
 # Python versions of vector and matrix types
@@ -275,8 +276,8 @@ for pair in zip(["int", "float", "bool", "uint", "float16_t"], [TypeReflection.S
     for dim in range(1, 5):
         vec_type: type = getattr(math, f"{base_name}{dim}")
         if vec_type is not None:
-            t = lambda layout, pytype, dim=dim, st=slang_scalar_type: VectorMarshall(
-                layout, st, dim)
+            t = lambda layout, pytype, dim=dim, st=slang_scalar_type: get_or_create_shared_marshall(
+                layout, VectorMarshall, st, dim)
             PYTHON_TYPES[vec_type] = t
             PYTHON_SIGNATURES[vec_type] = None
 
@@ -284,8 +285,8 @@ for pair in zip(["int", "float", "bool", "uint", "float16_t"], [TypeReflection.S
         for col in range(2, 5):
             mat_type = getattr(math, f"float{row}x{col}", None)
             if mat_type is not None:
-                t = lambda layout, pytype, row=row, st=slang_scalar_type, col=col: MatrixMarshall(
-                    layout, st, row, col)
+                t = lambda layout, pytype, row=row, st=slang_scalar_type, col=col: get_or_create_shared_marshall(
+                    layout, MatrixMarshall, st, row, col)
                 t.python_type = mat_type
                 PYTHON_TYPES[mat_type] = t
                 PYTHON_SIGNATURES[mat_type] = None
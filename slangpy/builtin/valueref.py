@@ -1,5 +1,8 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
-from typing import Any
+import struct
+from collections import deque
+from typing import Any, Optional
+from weakref import WeakKeyDictionary
 
 import numpy as np
 import numpy.typing as npt
@@ -8,14 +11,23 @@ from sgl import BufferCursor
 from slangpy.core.native import AccessType, CallContext
 
 import slangpy.reflection as kfr
-from slangpy.backend import Buffer, ResourceUsage
+from slangpy.backend import Buffer, Device, ResourceUsage
 from slangpy.bindings import (PYTHON_TYPES, Marshall, BindContext,
                               BoundVariable, BoundVariableRuntime,
-                              CodeGenBlock, ReturnContext, get_or_create_type)
+                              CodeGenBlock, ReturnContext, get_or_create_type,
+                              get_or_create_shared_marshall)
 from slangpy.builtin.value import slang_type_to_return_type
 from slangpy.types import ValueRef
 
 
+# Little endian struct format character for each numpy scalar type used by slang.
+_STRUCT_FORMATS: dict[Any, str] = {
+    np.int8: "b", np.int16: "h", np.int32: "i", np.int64: "q",
+    np.uint8: "B", np.uint16: "H", np.uint32: "I", np.uint64: "Q",
+    np.float16: "e", np.float32: "f", np.float64: "d",
+}
+
+
 def slang_value_to_numpy(slang_type: kfr.SlangType, value: Any) -> npt.NDArray[Any]:
     if isinstance(slang_type, kfr.ScalarType):
         # value should be a basic python type (int/float/bool)
@@ -52,6 +64,53 @@ def numpy_to_slang_value(slang_type: kfr.SlangType, value: npt.NDArray[Any]) ->
         raise ValueError(f"Can not convert numpy array to slang type {slang_type}")
 
 
+class _BufferPool:
+    """
+    Pool of small single element buffers used by writable value refs, bucketed per
+    device by struct size and usage. Buffers are returned to the pool once their
+    result has been read back, avoiding a GPU allocation per call. Devices are
+    weakly referenced, and a device's buffers are also dropped as soon as it is
+    closed.
+    """
+
+    #: Maximum number of free buffers kept per bucket. Oldest are evicted first.
+    MAX_PER_BUCKET = 16
+
+    def __init__(self):
+        super().__init__()
+        self._free: 'WeakKeyDictionary[Device, dict[tuple[int, ResourceUsage], deque[Buffer]]]' = WeakKeyDictionary()
+
+    def acquire(self, device: Device, struct_size: int, usage: ResourceUsage) -> Buffer:
+        buckets = self._free.get(device)
+        if buckets is not None:
+            bucket = buckets.get((struct_size, usage))
+            if bucket:
+                return bucket.pop()
+        return device.create_buffer(element_count=1, struct_size=struct_size, usage=usage)
+
+    def release(self, buffer: Buffer):
+        device = buffer.device
+        buckets = self._free.get(device)
+        if buckets is None:
+            buckets = {}
+            self._free[device] = buckets
+            device.register_device_close_callback(self._on_device_close)
+        key = (buffer.struct_size, buffer.desc.usage)
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = deque(maxlen=self.MAX_PER_BUCKET)
+            buckets[key] = bucket
+        bucket.append(buffer)
+
+    def _on_device_close(self, device: Device):
+        self._free.pop(device, None)
+
+
+_BUFFER_POOL = _BufferPool()
+
+_VALUE_REF_USAGE = ResourceUsage.shader_resource | ResourceUsage.unordered_access
+
+
 class ValueRefMarshall(Marshall):
 
     def __init__(self, layout: kfr.SlangProgramLayout, value_type: kfr.SlangType):
@@ -66,6 +125,17 @@ class ValueRefMarshall(Marshall):
         assert value_type.shape.concrete
         self.concrete_shape = value_type.shape
 
+        # Scalars and vectors are packed straight into bytes for upload, which is
+        # much cheaper than building a typed numpy array. Marshalls are shared
+        # between values, so nothing here may change after construction.
+        self._packer: Optional[struct.Struct] = None
+        if isinstance(value_type, (kfr.ScalarType, kfr.VectorType)):
+            fmt = _STRUCT_FORMATS.get(kfr.SCALAR_TYPE_TO_NUMPY_TYPE.get(value_type.slang_scalar_type))
+            if fmt is not None:
+                count = value_type.num_elements if isinstance(value_type, kfr.VectorType) else 1
+                self._packer = struct.Struct(f"<{count}{fmt}")
+        self._return_type: Any = slang_type_to_return_type(value_type) if self._packer is not None else None
+
     # Values don't store a derivative - they're just a value
     @property
     def has_derivative(self) -> bool:
@@ -87,61 +157,84 @@ class ValueRefMarshall(Marshall):
 
     # Call data can only be read access to primal, and simply declares it as a variable
     def gen_calldata(self, cgb: CodeGenBlock, context: BindContext, binding: 'BoundVariable'):
-        access = binding.access
-        name = binding.variable_name
-        assert access[0] != AccessType.none
-        assert access[1] == AccessType.none
-        if access[0] == AccessType.read:
-            cgb.type_alias(f"_t_{name}", f"ValueRef<{binding.vector_type.full_name}>")
-        else:
-            cgb.type_alias(
-                f"_t_{name}", f"RWValueRef<{binding.vector_type.full_name}>")
+        primal_access, derivative_access = binding.access
+        assert primal_access != AccessType.none and derivative_access == AccessType.none
+        prefix = "" if primal_access == AccessType.read else "RW"
+        cgb.type_alias(
+            f"_t_{binding.variable_name}", f"{prefix}ValueRef<{binding.vector_type.full_name}>")
 
     # Call data just returns the primal
     def create_calldata(self, context: CallContext, binding: 'BoundVariableRuntime', data: ValueRef) -> Any:
-        access = binding.access
-        assert access[0] != AccessType.none
-        assert access[1] == AccessType.none
-        if access[0] == AccessType.read:
+        if not binding.writes_primal:
             return {'value': data.value}
         else:
+            # Write only refs (out parameters and return values) are never loaded by
+            # the kernel, so their current value doesn't need uploading.
+            upload = binding.access[0] == AccessType.readwrite
             if isinstance(binding.vector_type, kfr.StructType):
-                buffer = context.device.create_buffer(
-                    element_count=1, struct_size=binding.vector_type.buffer_layout.stride, usage=ResourceUsage.shader_resource | ResourceUsage.unordered_access)
-                cursor = BufferCursor(binding.vector_type.buffer_layout.reflection, buffer, False)
-                cursor[0].write(data.value)
-                cursor.apply()
+                buffer = _BUFFER_POOL.acquire(
+                    context.device, binding.vector_type.buffer_layout.stride, _VALUE_REF_USAGE)
+                if upload:
+                    cursor = BufferCursor(binding.vector_type.buffer_layout.reflection, buffer, False)
+                    cursor[0].write(data.value)
+                    cursor.apply()
                 return {
                     'value': buffer
                 }
             else:
-                if isinstance(self.value_type, kfr.SlangType):
-                    npdata = slang_value_to_numpy(self.value_type, data.value)
+                if upload or self._packer is None:
+                    npdata = self._value_to_bytes(data.value)
+                    buffer = _BUFFER_POOL.acquire(context.device, npdata.size, _VALUE_REF_USAGE)
+                    buffer.copy_from_numpy(npdata)
                 else:
-                    npdata = self.value_type.to_numpy(data.value)
-                npdata = npdata.view(dtype=np.uint8)
+                    buffer = _BUFFER_POOL.acquire(context.device, self._packer.size, _VALUE_REF_USAGE)
                 return {
-                    'value': context.device.create_buffer(element_count=1, struct_size=npdata.size, data=npdata, usage=ResourceUsage.shader_resource | ResourceUsage.unordered_access)
+                    'value': buffer
                 }
 
+    def _value_to_bytes(self, value: Any) -> npt.NDArray[np.uint8]:
+        # Converts into a new array each call: the marshall is shared between
+        # values, and the upload needs a writable array, so nothing is reused.
+        vt = self.value_type
+        if not isinstance(vt, kfr.SlangType):
+            return vt.to_numpy(value).view(dtype=np.uint8)
+
+        packer = self._packer
+        if packer is not None:
+            packed = bytearray(packer.size)
+            if isinstance(vt, kfr.ScalarType):
+                packer.pack_into(packed, 0, value)
+            else:
+                packer.pack_into(packed, 0, *[value[i] for i in range(vt.num_elements)])
+            return np.frombuffer(packed, dtype=np.uint8)
+        return slang_value_to_numpy(vt, value).view(dtype=np.uint8)
+
     # Value ref just passes its value for raw dispatch
     def create_dispatchdata(self, data: Any) -> Any:
         return data
 
     # Read back from call data
     def read_calldata(self, context: CallContext, binding: 'BoundVariableRuntime', data: ValueRef, result: Any) -> None:
-        access = binding.access
-        if access[0] in [AccessType.write, AccessType.readwrite]:
+        if binding.writes_primal:
             assert isinstance(result['value'], Buffer)
             if isinstance(binding.vector_type, kfr.StructType):
                 cursor = BufferCursor(binding.vector_type.buffer_layout.reflection, result['value'])
                 data.value = cursor[0].read()
             else:
                 npdata = result['value'].to_numpy()
-                if isinstance(self.value_type, kfr.SlangType):
+                if self._packer is not None:
+                    # Unpack straight from the read back bytes rather than through a
+                    # typed numpy view.
+                    values = self._packer.unpack_from(npdata)
+                    if isinstance(self.value_type, kfr.ScalarType):
+                        data.value = self._return_type(values[0])
+                    else:
+                        data.value = self._return_type(*values)
+                elif isinstance(self.value_type, kfr.SlangType):
                     data.value = numpy_to_slang_value(self.value_type, npdata)
                 else:
                     data.value = self.value_type.copy_from_numpy(npdata)
+            _BUFFER_POOL.release(result['value'])
 
     def create_output(self, context: CallContext, binding: BoundVariableRuntime) -> Any:
         pt = slang_type_to_return_type(self.value_type)
@@ -156,9 +249,10 @@ class ValueRefMarshall(Marshall):
 
 def create_vr_type_for_value(layout: kfr.SlangProgramLayout, value: Any):
     if isinstance(value, ValueRef):
-        return ValueRefMarshall(layout, get_or_create_type(layout, type(value.value), value.value).slang_type)
+        value_type = get_or_create_type(layout, type(value.value), value.value).slang_type
+        return get_or_create_shared_marshall(layout, ValueRefMarshall, value_type)
     elif isinstance(value, ReturnContext):
-        return ValueRefMarshall(layout, value.slang_type)
+        return get_or_create_shared_marshall(layout, ValueRefMarshall, value.slang_type)
     else:
         raise ValueError(f"Unsupported value type {type(value)}")
 
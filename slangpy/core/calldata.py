@@ -2,15 +2,18 @@
 import hashlib
 import os
 import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Union
 
 from slangpy.core.callsignature import *
 from slangpy.core.logging import (bound_call_table, bound_exception_info,
                                   mismatch_info)
 from slangpy.core.native import CallMode, NativeCallData
 
-from slangpy.backend import SlangCompileError, SlangLinkOptions
+from slangpy.backend import (ComputeKernel, SlangCompileError,
+                             SlangLinkOptions, TypeConformance)
 from slangpy.bindings import (BindContext, BoundCallRuntime,
                               BoundVariableException, CodeGen)
 from slangpy.bindings.boundvariable import BoundCall, BoundVariable
@@ -18,16 +21,30 @@ from slangpy.reflection import SlangFunction
 
 if TYPE_CHECKING:
     from slangpy.core.function import FunctionNode
+    from slangpy.core.module import Module
 
 SLANG_PATH = Path(__file__).parent.parent / "slang"
 
-_DUMP_GENERATED_SHADERS = False
-_DUMP_SLANG_INTERMEDIATES = False
+_DUMP_GENERATED_SHADERS = os.environ.get("SLANGPY_DUMP_SHADERS") == "1"
+_DUMP_SLANG_INTERMEDIATES = os.environ.get("SLANGPY_DUMP_INTERMEDIATES") == "1"
+
+# Background kernel compilation used by precompile_call_data. The slang session is
+# not re-entrant, so a single worker compiles while the calling thread carries on
+# generating code. The lock keeps that worker and any direct compiles from using
+# the session at the same time.
+_COMPILE_POOL: Optional[ThreadPoolExecutor] = None
+_COMPILE_LOCK = threading.Lock()
+_PRECOMPILE = threading.local()
+
+# Patterns used to build file names when dumping shaders
+_SANITIZE_MODULE_NAME = re.compile(r"[<>, ./]")
+_SANITIZE_FUNCTION_NAME = re.compile(r"[:<>, ./]")
 
 
 def set_dump_generated_shaders(value: bool):
     """
-    Specify whether to dump generated shaders to .temp for analysis.
+    Specify whether to dump generated shaders to .temp for analysis. Can also be
+    enabled by setting the SLANGPY_DUMP_SHADERS environment variable to 1.
     """
     global _DUMP_GENERATED_SHADERS
     _DUMP_GENERATED_SHADERS = value
@@ -35,34 +52,155 @@ def set_dump_generated_shaders(value: bool):
 
 def set_dump_slang_intermediates(value: bool):
     """
-    Specify whether to dump slang compiler intermediates for analysis.
+    Specify whether to dump slang compiler intermediates for analysis. Can also be
+    enabled by setting the SLANGPY_DUMP_INTERMEDIATES environment variable to 1.
     """
     global _DUMP_SLANG_INTERMEDIATES
     _DUMP_SLANG_INTERMEDIATES = value
 
 
+def write_shader_dump(path: str, text: Union[str, bytes]):
+    """
+    Write a dumped shader to a temporary file, then move it into place so tools
+    watching the dump folder never see a partially written file.
+    """
+    data = text.encode("utf-8") if isinstance(text, str) else text
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def hash_code(code: Union[str, bytes, memoryview], prefix: str = "") -> str:
+    """
+    Hash generated kernel code to a short hex string, used both as the name of the
+    generated module and as the kernel cache key. BLAKE2b with a 128 bit digest is
+    plenty to avoid collisions and considerably cheaper than SHA-256 on large sources.
+    The prefix is hashed as if prepended to the code, and already encoded code can be
+    passed to avoid encoding it again.
+    """
+    hasher = hashlib.blake2b(prefix.encode(), digest_size=16)
+    hasher.update(code.encode() if isinstance(code, str) else code)
+    return hasher.hexdigest()
+
+
+def _contains_attr(arg: Any, attr: str) -> bool:
+    """
+    Check whether arg, or any value nested in it through dicts and lists, has
+    the given attribute. Uses an explicit stack rather than recursion.
+    """
+    stack = [arg]
+    while stack:
+        value = stack.pop()
+        if hasattr(value, attr):
+            return True
+        if isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
+
+
 def unpack_arg(arg: Any) -> Any:
+    # Common case is no IThis anywhere in the argument, in which case it
+    # can be used as is without rebuilding any dicts or lists.
+    if not _contains_attr(arg, "get_this"):
+        return arg
+    return _unpack_arg_recurse(arg)
+
+
+def _unpack_arg_recurse(arg: Any) -> Any:
     if hasattr(arg, "get_this"):
         arg = arg.get_this()
     if isinstance(arg, dict):
-        arg = {k: unpack_arg(v) for k, v in arg.items()}
+        arg = {k: _unpack_arg_recurse(v) for k, v in arg.items()}
     if isinstance(arg, list):
-        arg = [unpack_arg(v) for v in arg]
+        arg = [_unpack_arg_recurse(v) for v in arg]
     return arg
 
 
 def pack_arg(arg: Any, unpacked_arg: Any):
+    if not _contains_attr(arg, "update_this"):
+        return arg
+    return _pack_arg_recurse(arg, unpacked_arg)
+
+
+def _pack_arg_recurse(arg: Any, unpacked_arg: Any):
     if hasattr(arg, "update_this"):
         arg.update_this(unpacked_arg)
     if isinstance(arg, dict):
         for k, v in arg.items():
-            pack_arg(v, unpacked_arg[k])
+            _pack_arg_recurse(v, unpacked_arg[k])
     if isinstance(arg, list):
         for i, v in enumerate(arg):
-            pack_arg(v, unpacked_arg[i])
+            _pack_arg_recurse(v, unpacked_arg[i])
     return arg
 
 
+def _compile_kernel(module: 'Module', code_hash: str, code: str,
+                    type_conformances: list[TypeConformance], dump_prefix: str) -> ComputeKernel:
+    """
+    Compile and link generated code into a compute kernel, storing it in the module's
+    kernel cache. The slang session is not re-entrant, so compiles are serialized.
+    """
+    with _COMPILE_LOCK:
+        # Another thread may have compiled the same kernel while this one waited.
+        kernel = module.kernel_cache.get(code_hash)
+        if kernel is not None:
+            return kernel
+
+        # Build new module and link it with the one that contains the function being called.
+        session = module.session
+        slang_module = session.load_module_from_source(code_hash, code)
+        ep = slang_module.entry_point("main", type_conformances)
+        opts = SlangLinkOptions()
+        opts.dump_intermediates = _DUMP_SLANG_INTERMEDIATES
+        opts.dump_intermediates_prefix = dump_prefix
+        program = session.link_program(
+            [slang_module, module.device_module]+module.link, [ep], opts)
+        kernel = session.device.create_compute_kernel(program)
+        module.kernel_cache[code_hash] = kernel
+    return kernel
+
+
+def _load_or_compile_kernel(module: 'Module', code_hash: str, code: str,
+                            type_conformances: list[TypeConformance], dump_prefix: str) -> ComputeKernel:
+    """
+    Return the compute kernel for the generated code with the given hash, compiling and
+    linking it on first use. Compiled kernels are cached on the module, and the device's
+    shader cache (if enabled) avoids recompiling identical kernels across runs.
+    """
+    kernel = module.kernel_cache.get(code_hash)
+    if kernel is not None:
+        return kernel
+    return _compile_kernel(module, code_hash, code, type_conformances, dump_prefix)
+
+
+def _get_compile_pool() -> ThreadPoolExecutor:
+    global _COMPILE_POOL
+    if _COMPILE_POOL is None:
+        _COMPILE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slangpy_compile")
+    return _COMPILE_POOL
+
+
+def precompile_call_data(func: 'FunctionNode', calls: Iterable[tuple[tuple[Any, ...], dict[str, Any]]]):
+    """
+    Generate kernels for each (args, kwargs) pair and compile them on a background
+    thread, so compilation overlaps with python code generation for the remaining
+    pairs. Compiles themselves still run one at a time. Returns once all kernels are
+    in the module's kernel cache.
+    """
+    futures: dict[str, Future[ComputeKernel]] = {}
+    _PRECOMPILE.futures = futures
+    try:
+        for args, kwargs in calls:
+            CallData(func, *args, **kwargs)
+    finally:
+        _PRECOMPILE.futures = None
+    for future in futures.values():
+        future.result()
+
+
 class CallData(NativeCallData):
     def __init__(
         self,
@@ -97,12 +235,10 @@ class CallData(NativeCallData):
             context = BindContext(self.layout, self.call_mode,
                                   build_info.module.device_module, build_info.options)
 
-            # Build the unbound signature from inputs
-            bindings = BoundCall(context, *unpacked_args, **unpacked_kwargs)
-
-            # Apply explicit to the Python variables
-            apply_explicit_vectorization(
-                context, bindings, positional_mapping, keyword_mapping)
+            # Build the unbound signature from inputs, applying explicit
+            # vectorization to the Python variables as they are created.
+            bindings = BoundCall.from_args_with_mapping(
+                context, unpacked_args, unpacked_kwargs, positional_mapping, keyword_mapping)
 
             # Perform specialization to get a concrete function reflection
             slang_function = specialize(
@@ -139,8 +275,9 @@ class CallData(NativeCallData):
             # If necessary, create return value node once call dimensionality is known.
             create_return_value_binding(context, bindings, return_type)
 
-            # Calculate final mappings for bindings that only have known vector type.
-            finalize_mappings(context, bindings)
+            # Calculate final mappings for bindings that only have known vector type, and
+            # differentiability of all variables.
+            finalize_mappings_and_differentiability(context, bindings)
 
             # Should no longer have any unresolved mappings for anything.
             assert not bindings.has_implicit_mappings
@@ -148,9 +285,6 @@ class CallData(NativeCallData):
             # Validate the arguments we're going to pass to slang before trying to make code.
             validate_specialize(context, bindings, slang_function)
 
-            # Calculate differentiability of all variables.
-            calculate_differentiability(context, bindings)
-
             # Generate code.
             codegen = CodeGen()
             generate_code(context, build_info, bindings, codegen)
@@ -161,12 +295,15 @@ class CallData(NativeCallData):
                                   trampoline=True, context=True, snippets=True,
                                   call_data_structs=True, constants=True)
 
+            # Encode once, for both hashing and dumping.
+            code_bytes = code.encode()
+
             # Optionally write the shader to a file for debugging.
             sanitized = ""
             if _DUMP_GENERATED_SHADERS or _DUMP_SLANG_INTERMEDIATES:
                 os.makedirs(".temp", exist_ok=True)
-                santized_module = re.sub(r"[<>, ./]", "_", build_info.module.name)
-                sanitized = re.sub(r"[:<>, ./]", "_", build_info.name)
+                santized_module = _SANITIZE_MODULE_NAME.sub("_", build_info.module.name)
+                sanitized = _SANITIZE_FUNCTION_NAME.sub("_", build_info.name)
                 fn = f".temp/{santized_module}_{sanitized}{'_backwards' if self.call_mode == CallMode.bwds else ''}"
                 # Some platforms have path length limits that are easily exceeded with nested generics
                 # Be a good citizen here and limit the length of what we generate
@@ -175,40 +312,26 @@ class CallData(NativeCallData):
                     fn = fn[:length_limit]
                 fn = fn + ".slang"
 
-                # with open(fn,"r") as f:
-                #    code = f.read()
-                with open(fn, "w",) as f:
-                    f.write("/*\n")
-                    f.write(bound_call_table(bindings))
-                    f.write("\n*/\n")
-                    f.write(code)
+                write_shader_dump(fn, ("/*\n" + bound_call_table(bindings) +
+                                       "\n*/\n").encode() + code_bytes)
 
             # Hash the code to get a unique identifier for the module.
             # We add type conformances to the start of the code to ensure that the hash is unique
             assert function.slangpy_signature is not None
-            code_minus_header = "[CallData]\n" + str(build_info.type_conformances) + \
-                code[len(codegen.header):]
-            hash = hashlib.sha256(code_minus_header.encode()).hexdigest()
-
-            # Check if we've already built this module.
-            if hash in build_info.module.kernel_cache:
-                # Get kernel from cache if we have
-                self.kernel = build_info.module.kernel_cache[hash]
-                self.device = build_info.module.device
+            hash = hash_code(memoryview(code_bytes)[len(codegen.header.encode()):],
+                             prefix="[CallData]\n" + str(build_info.type_conformances))
+
+            # Get the kernel, either from the module's cache or by compiling it. When
+            # precompiling, the compile is queued instead and this call data discarded.
+            precompile_futures = getattr(_PRECOMPILE, 'futures', None)
+            if precompile_futures is not None:
+                if hash not in build_info.module.kernel_cache and hash not in precompile_futures:
+                    precompile_futures[hash] = _get_compile_pool().submit(
+                        _compile_kernel, build_info.module, hash, code, type_conformances, sanitized)
             else:
-                # Build new module and link it with the one that contains the function being called.
-                session = build_info.module.session
-                device = session.device
-                module = session.load_module_from_source(hash, code)
-                ep = module.entry_point(f"main", type_conformances)
-                opts = SlangLinkOptions()
-                opts.dump_intermediates = _DUMP_SLANG_INTERMEDIATES
-                opts.dump_intermediates_prefix = sanitized
-                program = session.link_program(
-                    [module, build_info.module.device_module]+build_info.module.link, [ep], opts)
-                self.kernel = device.create_compute_kernel(program)
-                build_info.module.kernel_cache[hash] = self.kernel
-                self.device = device
+                self.kernel = _load_or_compile_kernel(
+                    build_info.module, hash, code, type_conformances, sanitized)
+            self.device = build_info.module.device
 
             # Store the bindings and runtime for later use.
             self.debug_only_bindings = bindings
@@ -9,7 +9,7 @@ from slangpy.backend import ModifierID, TypeReflection
 from slangpy.bindings.marshall import Marshall, BindContext, ReturnContext
 from slangpy.bindings.boundvariable import (BoundCall, BoundVariable,
                                             BoundVariableException)
-from slangpy.bindings.codegen import CodeGen
+from slangpy.bindings.codegen import CodeGen, CodeGenBlock
 from slangpy.builtin.value import NoneMarshall, ValueMarshall
 from slangpy.reflection.reflectiontypes import SlangFunction, SlangType
 from slangpy.types.buffer import NDBuffer
@@ -256,14 +256,6 @@ def bind(
     return res
 
 
-def apply_explicit_vectorization(context: BindContext, call: BoundCall, args: tuple[Any, ...], kwargs: dict[str, Any]):
-    """
-    Apply user supplied explicit vectorization options to the python variables.
-    """
-    call.apply_explicit_vectorization(context, args, kwargs)
-    return call
-
-
 def apply_implicit_vectorization(context: BindContext, call: BoundCall):
     """
     Apply implicit vectorization rules and calculate per variable dimensionality
@@ -272,32 +264,22 @@ def apply_implicit_vectorization(context: BindContext, call: BoundCall):
     return call
 
 
-def finalize_mappings(context: BindContext, call: BoundCall):
+def finalize_mappings_and_differentiability(context: BindContext, call: BoundCall):
     """
-    Once overall call dimensionality is known, calculate any explicit
-    mappings for variables that only have explicit types
+    Finalize mappings and calculate differentiability of all variables in a
+    single pass. Requires call dimensionality to be known.
     """
-    call.finalize_mappings(context)
+    call.finalize(context)
     return call
 
 
-def calculate_differentiability(context: BindContext, call: BoundCall):
-    """
-    Calculate differentiability of all variables
-    """
-    for arg in call.args:
-        arg.calculate_differentiability(context)
-    for arg in call.kwargs.values():
-        arg.calculate_differentiability(context)
-
-
 def calculate_call_dimensionality(signature: BoundCall) -> int:
     """
     Calculate the dimensionality of the call
     """
     dimensionality = 0
     nodes: list[BoundVariable] = []
-    for node in signature.values():
+    for node in signature.iter_values():
         node.get_input_list(nodes)
     for input in nodes:
         if input.call_dimensionality is not None:
@@ -351,6 +333,54 @@ def generate_constants(build_info: 'FunctionBuildInfo', cg: CodeGen):
                 )
 
 
+#: Name of the generated trampoline function called by the kernel entry point.
+_TRAMPOLINE_FN = "_trampoline"
+
+#: Generated kernel entry point code, keyed by (call dimensionality, call mode).
+#: The entry point only depends on these, so is built once and reused.
+_KERNEL_ENTRY_POINTS: dict[tuple[int, CallMode], str] = {}
+
+
+def _kernel_entry_point(cg: CodeGen, call_data_len: int, call_mode: CallMode) -> str:
+    key = (call_data_len, call_mode)
+    code = _KERNEL_ENTRY_POINTS.get(key)
+    if code is not None:
+        return code
+
+    kernel = CodeGenBlock(cg)
+    kernel.append_line('[shader("compute")]')
+    kernel.append_line("[numthreads(32, 1, 1)]")
+    kernel.append_line("void main(uint3 dispatchThreadID: SV_DispatchThreadID)")
+    kernel.begin_block()
+    kernel.append_statement(
+        "if (any(dispatchThreadID >= call_data._thread_count)) return")
+
+    # Loads / initializes call id
+    context_args = "dispatchThreadID"
+    if call_data_len > 0:
+        kernel.append_line(f"int[{call_data_len}] call_id = {{")
+        kernel.inc_indent()
+        for i in range(call_data_len):
+            kernel.append_line(
+                f"(dispatchThreadID.x/call_data._call_stride[{i}]) % call_data._call_dim[{i}],")
+        kernel.dec_indent()
+        kernel.append_statement("}")
+        context_args += ", call_id"
+    kernel.append_statement(f"Context context = {{{context_args}}}")
+
+    # Call the trampoline function
+    fn = _TRAMPOLINE_FN
+    if call_mode == CallMode.bwds:
+        fn = f"bwd_diff({fn})"
+    kernel.append_statement(f"{fn}(context, call_data)")
+
+    kernel.end_block()
+
+    code = kernel.finish()
+    _KERNEL_ENTRY_POINTS[key] = code
+    return code
+
+
 def generate_code(context: BindContext, build_info: 'FunctionBuildInfo', signature: BoundCall, cg: CodeGen):
     """
     Generate a list of call data nodes that will be used to generate the call
@@ -375,17 +405,16 @@ def generate_code(context: BindContext, build_info: 'FunctionBuildInfo', signatu
     cg.context.type_alias("Context", f"ContextND<{context.call_dimensionality}>")
 
     # Generate call data definitions for all inputs to the kernel
-    for node in signature.values():
+    for node in signature.iter_values():
         node.gen_call_data_code(cg, context)
 
     # Get sorted list of root parameters for trampoline function
-    root_params = sorted(signature.values(), key=lambda x: x.param_index)
+    root_params = sorted(signature.iter_values(), key=lambda x: x.param_index)
 
     # Generate the trampoline function
-    trampoline_fn = "_trampoline"
     if context.call_mode != CallMode.prim:
         cg.trampoline.append_line("[Differentiable]")
-    cg.trampoline.append_line(f"void {trampoline_fn}(Context context, CallData data)")
+    cg.trampoline.append_line(f"void {_TRAMPOLINE_FN}(Context context, CallData data)")
     cg.trampoline.begin_block()
 
     # Declare parameters and load inputs
@@ -395,7 +424,7 @@ def generate_code(context: BindContext, build_info: 'FunctionBuildInfo', signatu
     for x in root_params:
         if x.access[0] == AccessType.read or x.access[0] == AccessType.readwrite:
             cg.trampoline.append_statement(
-                f"data.{x.variable_name}.load(context.map(_m_{x.variable_name}), {x.variable_name})")
+                f"data.{x.variable_name}.load({x.mapped_context(context.call_dimensionality)}, {x.variable_name})")
 
     cg.trampoline.append_indent()
     if any(x.variable_name == '_result' for x in root_params):
@@ -426,36 +455,10 @@ def generate_code(context: BindContext, build_info: 'FunctionBuildInfo', signatu
                 raise BoundVariableException(
                     f"Cannot read back value for non-writable type", x)
             cg.trampoline.append_statement(
-                f"data.{x.variable_name}.store(context.map(_m_{x.variable_name}), {x.variable_name})")
+                f"data.{x.variable_name}.store({x.mapped_context(context.call_dimensionality)}, {x.variable_name})")
 
     cg.trampoline.end_block()
     cg.trampoline.append_line("")
 
     # Generate the main function
-    cg.kernel.append_line('[shader("compute")]')
-    cg.kernel.append_line("[numthreads(32, 1, 1)]")
-    cg.kernel.append_line("void main(uint3 dispatchThreadID: SV_DispatchThreadID)")
-    cg.kernel.begin_block()
-    cg.kernel.append_statement(
-        "if (any(dispatchThreadID >= call_data._thread_count)) return")
-
-    # Loads / initializes call id
-    context_args = "dispatchThreadID"
-    if call_data_len > 0:
-        cg.kernel.append_line(f"int[{call_data_len}] call_id = {{")
-        cg.kernel.inc_indent()
-        for i in range(call_data_len):
-            cg.kernel.append_line(
-                f"(dispatchThreadID.x/call_data._call_stride[{i}]) % call_data._call_dim[{i}],")
-        cg.kernel.dec_indent()
-        cg.kernel.append_statement("}")
-        context_args += ", call_id"
-    cg.kernel.append_statement(f"Context context = {{{context_args}}}")
-
-    # Call the trampoline function
-    fn = trampoline_fn
-    if context.call_mode == CallMode.bwds:
-        fn = f"bwd_diff({fn})"
-    cg.kernel.append_statement(f"{fn}(context, call_data)")
-
-    cg.kernel.end_block()
+    cg.kernel.append_code(_kernel_entry_point(cg, call_data_len, context.call_mode))
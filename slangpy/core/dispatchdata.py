@@ -1,5 +1,4 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
-import hashlib
 import os
 import re
 from typing import TYPE_CHECKING, Any, Optional
@@ -7,7 +6,7 @@ from typing import TYPE_CHECKING, Any, Optional
 from slangpy.core.callsignature import generate_constants
 from slangpy.core.enums import IOType
 from slangpy.core.native import CallMode, pack_arg, unpack_arg
-from slangpy.core.calldata import _DUMP_SLANG_INTERMEDIATES, _DUMP_GENERATED_SHADERS
+import slangpy.core.calldata as calldata
 
 from slangpy.backend import CommandBuffer, SlangLinkOptions, uint3
 from slangpy.core.native import NativeCallRuntimeOptions
@@ -132,21 +131,22 @@ void {reflection.name}_entrypoint({params}) {{
                                   trampoline=True, context=True, snippets=True,
                                   call_data_structs=True, constants=True)
 
+            # Encode once, for both hashing and dumping.
+            code_bytes = code.encode()
+
             sanitized = ""
-            if _DUMP_GENERATED_SHADERS or _DUMP_SLANG_INTERMEDIATES:
+            if calldata._DUMP_GENERATED_SHADERS or calldata._DUMP_SLANG_INTERMEDIATES:
                 # Write the shader to a file for debugging.
                 os.makedirs(".temp", exist_ok=True)
-                santized_module = re.sub(r"[<>, ./]", "_", build_info.module.name)
-                sanitized = re.sub(r"[<>, ]", "_", build_info.name)
+                santized_module = calldata._SANITIZE_MODULE_NAME.sub("_", build_info.module.name)
+                sanitized = calldata._SANITIZE_FUNCTION_NAME.sub("_", build_info.name)
                 fn = f".temp/{santized_module}_{sanitized}_dispatch.slang"
-                with open(fn, "w",) as f:
-                    f.write(code)
+                calldata.write_shader_dump(fn, code_bytes)
 
             # Hash the code to get a unique identifier for the module.
             # We add type conformances to the start of the code to ensure that the hash is unique
-            code_minus_header = "[DispatchData]\n" + str(build_info.type_conformances) + \
-                code[len(codegen.header):]
-            hash = hashlib.sha256(code_minus_header.encode()).hexdigest()
+            hash = calldata.hash_code(memoryview(code_bytes)[len(codegen.header.encode()):],
+                                      prefix="[DispatchData]\n" + str(build_info.type_conformances))
 
             # Check if we've already built this module.
             if hash in build_info.module.kernel_cache:
@@ -155,9 +155,7 @@ void {reflection.name}_entrypoint({params}) {{
                 self.device = build_info.module.device
             else:
                 # Load the module
-                module = session.load_module_from_source(
-                    hashlib.sha256(code.encode()).hexdigest()[0:16], code
-                )
+                module = session.load_module_from_source(hash, code)
 
                 # Get entry point if one wasn't specified
                 if ep is None:
@@ -166,7 +164,7 @@ void {reflection.name}_entrypoint({params}) {{
 
                 # Link the program
                 opts = SlangLinkOptions()
-                opts.dump_intermediates = _DUMP_SLANG_INTERMEDIATES
+                opts.dump_intermediates = calldata._DUMP_SLANG_INTERMEDIATES
                 opts.dump_intermediates_prefix = sanitized
                 program = session.link_program(
                     [module, build_info.module.device_module]+build_info.module.link, [ep], opts)
@@ -12,3 +12,9 @@ class IOType(Enum):
 class PrimType(Enum):
     primal = 0
     derivative = 1
+
+
+#: (prim type, index, name) for each PrimType, avoiding enum iteration and
+#: attribute lookups in per call code.
+PRIM_TYPE_ITEMS: tuple[tuple[PrimType, int, str], ...] = tuple(
+    (p, p.value, p.name) for p in PrimType)
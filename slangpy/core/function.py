@@ -7,7 +7,6 @@ from slangpy.core.native import (CallMode, SignatureBuilder,
 
 from slangpy.reflection import SlangFunction, SlangType
 from slangpy.backend import (CommandBuffer, TypeConformance, uint3)
-from slangpy.bindings.typeregistry import PYTHON_SIGNATURES
 
 if TYPE_CHECKING:
     from slangpy.core.calldata import CallData
@@ -16,16 +15,12 @@ if TYPE_CHECKING:
 
 ENABLE_CALLDATA_CACHE = True
 
-
-TCallHook = Callable[['Function'], None]
+#: Maximum number of raw dispatch signatures cached per module. Least recently
+#: used entries are evicted first.
+DISPATCH_DATA_CACHE_SIZE = 256
 
 
-def _cache_value_to_id(val: Any) -> str:
-    cb = PYTHON_SIGNATURES.get(type(val))
-    if cb is None:
-        return ""
-    else:
-        return cb(val)
+TCallHook = Callable[['Function'], None]
 
 
 class IThis(Protocol):
@@ -191,6 +186,15 @@ class FunctionNode(NativeFunctionNode):
         """
         return self._native_build_call_data(self.module.call_data_cache, *args, **kwargs)
 
+    def precompile(self, *calls: tuple[tuple[Any, ...], dict[str, Any]]):
+        """
+        Generate and compile kernels up front for one or more (args, kwargs) pairs, so
+        later calls with matching argument types skip compilation. Compiles run one at a
+        time on a background thread, overlapping with code generation for the remaining pairs.
+        """
+        from slangpy.core.calldata import precompile_call_data
+        precompile_call_data(self, calls)
+
     def call(self, *args: Any, **kwargs: Any) -> Any:
         """
         Call the function with a given set of arguments. This will generate and compile
@@ -255,17 +259,24 @@ class FunctionNode(NativeFunctionNode):
                 lines.append(str(build_info.thread_group_size))
                 self.slangpy_signature = "\n".join(lines)
 
+            # The signature builder is populated in place with the function
+            # and argument signatures, so read the key back from it.
             builder = SignatureBuilder()
-            sig = self.module.call_data_cache.get_args_signature(builder, self, **kwargs)
+            self.module.call_data_cache.get_args_signature(builder, self, **kwargs)
+            sig = builder.str
 
-            if sig in self.module.dispatch_data_cache:
-                dispatch_data = self.module.dispatch_data_cache[sig]
+            cache = self.module.dispatch_data_cache
+            dispatch_data = cache.get(sig)
+            if dispatch_data is not None:
                 if dispatch_data.device != self.module.device:
                     raise NameError("Cached CallData is linked to wrong device")
+                cache.move_to_end(sig)
             else:
                 from slangpy.core.dispatchdata import DispatchData
                 dispatch_data = DispatchData(self, **kwargs)
-                self.module.dispatch_data_cache[sig] = dispatch_data
+                cache[sig] = dispatch_data
+                if len(cache) > DISPATCH_DATA_CACHE_SIZE:
+                    cache.popitem(last=False)
         else:
             from slangpy.core.dispatchdata import DispatchData
             dispatch_data = DispatchData(self, **kwargs)
@@ -274,15 +285,27 @@ class FunctionNode(NativeFunctionNode):
         self.gather_runtime_options(opts)
         dispatch_data.dispatch(opts, thread_count, vars, command_buffer, **kwargs)
 
+    @property
+    def ancestors(self) -> list['FunctionNode']:
+        """
+        Get the list of nodes from the root function down to, but not including,
+        this node. Nodes are immutable, so this is built from the parent's list
+        once and cached.
+        """
+        ancestors: Optional[list[FunctionNode]] = self.__dict__.get('_ancestors')
+        if ancestors is None:
+            parent = cast(Optional[FunctionNode], self._native_parent)
+            ancestors = [] if parent is None else parent.ancestors + [parent]
+            self._ancestors = ancestors
+        return ancestors
+
     def calc_build_info(self):
+        # Apply each node's contribution root first.
         info = FunctionBuildInfo()
-        self._populate_build_info_recurse(info)
-        return info
-
-    def _populate_build_info_recurse(self, info: FunctionBuildInfo):
-        if self._native_parent is not None:
-            self.parent._populate_build_info_recurse(info)
+        for node in self.ancestors:
+            node._populate_build_info(info)
         self._populate_build_info(info)
+        return info
 
     def _populate_build_info(self, info: FunctionBuildInfo):
         pass
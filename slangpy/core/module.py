@@ -10,6 +10,7 @@ from slangpy.reflection import SlangProgramLayout
 from slangpy.bindings.typeregistry import PYTHON_SIGNATURES
 
 import weakref
+from collections import OrderedDict
 
 if TYPE_CHECKING:
     from slangpy.core.dispatchdata import DispatchData
@@ -32,13 +33,35 @@ def _register_hot_reload_hook(device: Device):
     device.register_shader_hot_reload_callback(_check_for_hot_reload)
 
 
+# Bound lookup of signature callbacks by type. The registry is only ever updated
+# in place, so later registrations are still seen.
+_lookup_signature = PYTHON_SIGNATURES.get
+
+# Returned by _lookup_signature for types that are not registered at all, as
+# opposed to types registered with no signature callback.
+_UNREGISTERED = object()
+
+# Qualified name signatures of unregistered types. Weakly keyed so that classes
+# created at runtime are not kept alive.
+_qualified_signatures: 'weakref.WeakKeyDictionary[type, str]' = weakref.WeakKeyDictionary()
+
+
 class CallDataCache(NativeCallDataCache):
     def lookup_value_signature(self, o: object):
-        sig = PYTHON_SIGNATURES.get(type(o))
-        if sig is not None:
-            return sig(o)
-        else:
+        t = type(o)
+        sig = _lookup_signature(t, _UNREGISTERED)
+        if sig is None:
             return None
+        elif sig is not _UNREGISTERED:
+            return sig(o)  # type: ignore
+
+        # The native builder only records the bare type name, so qualify
+        # unregistered types to keep same-named classes from sharing call data.
+        qualified = _qualified_signatures.get(t)
+        if qualified is None:
+            qualified = f"#{t.__module__}.{t.__qualname__}#"
+            _qualified_signatures[t] = qualified
+        return qualified
 
 
 class Module:
@@ -64,7 +87,7 @@ class Module:
         self.layout = SlangProgramLayout(combined_program.layout)
 
         self.call_data_cache = CallDataCache()
-        self.dispatch_data_cache: dict[str, 'DispatchData'] = {}
+        self.dispatch_data_cache: OrderedDict[str, 'DispatchData'] = OrderedDict()
         self.kernel_cache: dict[str, ComputeKernel] = {}
         self.link = [x.module if isinstance(x, Module) else x for x in link]
 
@@ -195,10 +218,20 @@ class Module:
         self.layout.on_hot_reload(combined_program.layout)
 
         # Clear all caches
+        self.clear_call_data_cache()
+        self._attr_cache = {}
+
+    def clear_call_data_cache(self):
+        """
+        Release all cached call data, raw dispatch data and compiled kernels for
+        this module. Long running applications that call functions with many
+        different argument signatures can use this to bound memory use. Kernels
+        will be regenerated on next use (the device shader cache, if enabled,
+        avoids recompiling them).
+        """
         self.call_data_cache = CallDataCache()
-        self.dispatch_data_cache = {}
+        self.dispatch_data_cache = OrderedDict()
         self.kernel_cache = {}
-        self._attr_cache = {}
 
     def __getattr__(self, name: str):
         """
@@ -21,6 +21,7 @@ class Struct:
         self.options = options
         self.struct = slang_struct
         self.slangpy_signature = self.struct.full_name
+        self._attr_cache: dict[str, Union[Struct, Function]] = {}
 
     @property
     def name(self) -> str:
@@ -64,7 +65,14 @@ class Struct:
         """
         Attempt to get either a child struct or method of this struct.
         """
+        child = self._attr_cache.get(name)
+        if child is None:
+            child = self._find_child(name)
+            if child is not None:
+                self._attr_cache[name] = child
+        return child
 
+    def _find_child(self, name: str) -> Optional[Union['Struct', 'Function']]:
         # First try to find the child using the search functions in the reflection API
 
         # Search for name as a fully qualified child struct
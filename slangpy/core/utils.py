@@ -1,4 +1,5 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
+import os
 from os import PathLike
 import pathlib
 from typing import Optional, Sequence, Union
@@ -10,17 +11,43 @@ from slangpy.reflection import SlangType
 import builtins
 
 
+def default_shader_cache_path() -> pathlib.Path:
+    """
+    Location of the persistent shader cache used by create_device when it is enabled.
+    This is under the SLANGPY_CACHE_DIR environment variable if set, otherwise under
+    ~/.cache/slangpy.
+    """
+    cache_dir = os.environ.get("SLANGPY_CACHE_DIR")
+    if cache_dir is None:
+        return pathlib.Path.home() / ".cache" / "slangpy" / "shader_cache"
+    return pathlib.Path(cache_dir) / "shader_cache"
+
+
 def create_device(type: DeviceType = DeviceType.automatic, enable_debug_layers: bool = False,
                   adapter_luid: Optional[Sequence[int]] = None,
-                  include_paths: Sequence[Union[str, PathLike]] = []):
+                  include_paths: Sequence[Union[str, PathLike]] = [],
+                  enable_shader_cache: Optional[bool] = None,
+                  shader_cache_path: Optional[Union[str, PathLike]] = None):
     """
     Create an SGL device with basic settings for SlangPy. For full control over device init, 
     use sgl.create_device directly, being sure to add slangpy.SHADER_PATH
     to the list of include paths for the compiler.
+
+    If enable_shader_cache is True, compiled kernels are stored in a persistent on-disk
+    cache at shader_cache_path (default_shader_cache_path if not given), so identical
+    kernels are not recompiled across runs. If it is left as None, the cache is only
+    enabled when the SLANGPY_CACHE_DIR environment variable is set.
     """
 
     shaderpath = str(pathlib.Path(__file__).parent.parent.absolute() / "slang")
 
+    if enable_shader_cache is None:
+        enable_shader_cache = "SLANGPY_CACHE_DIR" in os.environ
+    if enable_shader_cache and shader_cache_path is None:
+        shader_cache_path = default_shader_cache_path()
+    elif not enable_shader_cache:
+        shader_cache_path = None
+
     device = Device(
         type=type,
         compiler_options={
@@ -30,7 +57,8 @@ def create_device(type: DeviceType = DeviceType.automatic, enable_debug_layers:
         },
         enable_cuda_interop=True,
         enable_debug_layers=enable_debug_layers,
-        adapter_luid=adapter_luid)
+        adapter_luid=adapter_luid,
+        shader_cache_path=shader_cache_path)
 
     if is_running_in_jupyter():
         # Don't import until we know we're running in jupyter and we are certain the IPython module is available
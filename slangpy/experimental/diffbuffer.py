@@ -5,7 +5,7 @@ import numpy.typing as npt
 
 from slangpy.core.shapes import TShapeOrTuple
 
-from slangpy.backend import (Device, MemoryType,
+from slangpy.backend import (CommandBuffer, Device, MemoryType,
                              ResourceUsage)
 from slangpy.reflection import SlangProgramLayout
 from slangpy.types.buffer import NDBuffer, resolve_element_type, resolve_program_layout
@@ -126,6 +126,14 @@ class NDDifferentiableBuffer(NDBuffer):
         assert self.grad is not None
         self.grad.copy_from_numpy(data)
 
+    def clear_grad(self, command_buffer: Optional[CommandBuffer] = None):
+        """
+        Fill the gradient buffer with zeros on the device. If no command buffer is provided,
+        a new one is created and immediately submitted.
+        """
+        assert self.grad is not None
+        self.grad.clear(command_buffer)
+
     def grad_to_torch(self):
         """
         Returns the gradient buffer as a torch tensor.
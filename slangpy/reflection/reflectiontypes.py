@@ -140,6 +140,7 @@ class SlangType(NativeSlangType):
         self._program = program
         self._element_type = element_type
 
+        self._cached_full_name: Optional[str] = None
         self._cached_fields: Optional[dict[str, SlangField]] = None
         self._cached_differential: Optional[SlangType] = None
         self._cached_uniform_layout: Optional[SlangLayout] = None
@@ -159,6 +160,7 @@ class SlangType(NativeSlangType):
         cached data.
         """
         self.type_reflection = refl
+        self._cached_full_name = None
         self._cached_fields = None
         self._cached_differential = None
         self._cached_uniform_layout = None
@@ -184,7 +186,9 @@ class SlangType(NativeSlangType):
         """
         Fully qualified name of this type.
         """
-        return self.type_reflection.full_name
+        if self._cached_full_name is None:
+            self._cached_full_name = self.type_reflection.full_name
+        return self._cached_full_name
 
     @property
     def element_type(self) -> Optional[SlangType]:
@@ -333,6 +337,10 @@ class ScalarType(SlangType):
         return self.type_reflection.scalar_type
 
 
+#: Names of the fields of a vector, in element order.
+_VECTOR_FIELD_NAMES = ('x', 'y', 'z', 'w')
+
+
 class VectorType(SlangType):
     """
     Represents a vector type such as int3/float3/vector<float,3> etc.
@@ -372,8 +380,8 @@ class VectorType(SlangType):
         """
         Build fields for this vector type generates the x/y/z/w fields.
         """
-        names = ['x', 'y', 'z', 'w']
-        return {names[i]: self.scalar_type for i in range(self.num_elements)}
+        scalar_type = self.scalar_type
+        return {name: scalar_type for name in _VECTOR_FIELD_NAMES[:self.num_elements]}
 
 
 class MatrixType(SlangType):
@@ -613,6 +621,9 @@ class SlangFunction:
     Represents a Slang function.
     """
 
+    __slots__ = ('_this', '_reflection', '_program', '_cached_parameters', '_cached_return_type',
+                 '_full_name')
+
     def __init__(self, program: SlangProgramLayout, refl: FunctionReflection, this: Optional[SlangType], full_name: Optional[str]):
         super().__init__()
         self._this = this
@@ -710,11 +721,37 @@ class SlangFunction:
         return self.reflection.has_modifier(ModifierID.static)
 
 
+#: All modifier ids, enumerated once rather than per reflected variable.
+_ALL_MODIFIERS = tuple(ModifierID)
+
+
+def _reflected_modifiers(refl: VariableReflection) -> set[ModifierID]:
+    has_modifier = refl.has_modifier
+    return {mod for mod in _ALL_MODIFIERS if has_modifier(mod)}
+
+
+def io_type_from_modifiers(modifiers: set[ModifierID]) -> tuple[IOType, bool]:
+    """
+    Resolve the IO type (in/inout/out) and no_diff flag of a variable from its slang modifiers.
+    """
+    have_in = ModifierID.inn in modifiers
+    have_out = ModifierID.out in modifiers
+    if (have_in and have_out) or ModifierID.inout in modifiers:
+        io_type = IOType.inout
+    elif have_out:
+        io_type = IOType.out
+    else:
+        io_type = IOType.inn
+    return io_type, ModifierID.nodiff in modifiers
+
+
 class BaseSlangVariable:
     """
     Base class for slang variables (fields and parameters).
     """
 
+    __slots__ = ('_program', '_type', '_name', '_modifiers', '_io_type', '_no_diff')
+
     def __init__(self, program: SlangProgramLayout, slang_type: SlangType, name: str, modifiers: set[ModifierID]):
         super().__init__()
         self._program = program
@@ -722,6 +759,9 @@ class BaseSlangVariable:
         self._name = name
         self._modifiers = modifiers
 
+        # Modifiers are fixed, so resolve the ones queried during binding up front.
+        self._io_type, self._no_diff = io_type_from_modifiers(modifiers)
+
     @property
     def type(self) -> SlangType:
         """
@@ -754,25 +794,16 @@ class BaseSlangVariable:
     @property
     def io_type(self) -> IOType:
         """
-        Calculate IOType of this variable (in/inout/out) based on modifiers.
+        IOType of this variable (in/inout/out) based on modifiers.
         """
-        have_in = ModifierID.inn in self.modifiers
-        have_out = ModifierID.out in self.modifiers
-        have_inout = ModifierID.inout in self.modifiers
-
-        if (have_in and have_out) or have_inout:
-            return IOType.inout
-        elif have_out:
-            return IOType.out
-        else:
-            return IOType.inn
+        return self._io_type
 
     @property
     def no_diff(self) -> bool:
         """
         Whether this variable has the no_diff modifier.
         """
-        return ModifierID.nodiff in self.modifiers
+        return self._no_diff
 
     @property
     def differentiable(self) -> bool:
@@ -801,6 +832,8 @@ class SlangField(BaseSlangVariable):
     fields are enumerated.
     """
 
+    __slots__ = ('_reflection',)
+
     def __init__(self, program: SlangProgramLayout, slang_type: Optional[SlangType] = None, name: Optional[str] = None, modifiers: Optional[set[ModifierID]] = None, refl: Optional[VariableReflection] = None):
 
         if not ((slang_type is not None) ^ (refl is not None)):
@@ -812,7 +845,7 @@ class SlangField(BaseSlangVariable):
             assert modifiers is None
             slang_type = program.find_type(refl.type)
             name = refl.name
-            modifiers = {mod for mod in ModifierID if refl.has_modifier(mod)}
+            modifiers = _reflected_modifiers(refl)
         else:
             assert name is not None
             assert slang_type is not None
@@ -829,10 +862,12 @@ class SlangParameter(BaseSlangVariable):
     parameters are enumerated.
     """
 
+    __slots__ = ('_reflection', '_index', '_has_default')
+
     def __init__(self, program: SlangProgramLayout, refl: VariableReflection, index: int):
         slang_type = program.find_type(refl.type)
         name = refl.name
-        modifiers = {mod for mod in ModifierID if refl.has_modifier(mod)}
+        modifiers = _reflected_modifiers(refl)
         super().__init__(program, slang_type, name, modifiers)
         self._reflection = refl
 
@@ -871,10 +906,21 @@ class SlangProgramLayout:
         self._functions_by_name: dict[str, SlangFunction] = {}
         self._functions_by_reflection: dict[FunctionReflection, SlangFunction] = {}
 
+        # Names that failed to resolve, so repeated misses skip the program layout search.
+        self._missing_types: set[str] = set()
+        self._missing_functions: set[str] = set()
+
+        # Immutable marshalls shared by all values bound against this layout, keyed by
+        # marshall type and constructor arguments. See get_or_create_shared_marshall.
+        self._shared_marshalls: dict[tuple[Any, ...], Any] = {}
+
     def on_hot_reload(self, program_layout: ProgramLayout):
         if program_layout == self.program_layout:
             return
         self.program_layout = program_layout
+        self._missing_types = set()
+        self._missing_functions = set()
+        self._shared_marshalls = {}
 
         new_types_by_name: dict[str, SlangType] = {}
         new_types_by_reflection: dict[TypeReflection, SlangType] = {}
@@ -937,8 +983,11 @@ class SlangProgramLayout:
         existing = self._types_by_name.get(name)
         if existing is not None:
             return existing
+        if name in self._missing_types:
+            return None
         type_refl = self.program_layout.find_type_by_name(name)
         if type_refl is None:
+            self._missing_types.add(name)
             return None
         res = self._get_or_create_type(type_refl)
         return res
@@ -959,8 +1008,11 @@ class SlangProgramLayout:
         existing = self._functions_by_name.get(name)
         if existing is not None:
             return existing
+        if name in self._missing_functions:
+            return None
         func_refl = self.program_layout.find_function_by_name(name)
         if func_refl is None:
+            self._missing_functions.add(name)
             return None
         res = self._get_or_create_function(func_refl, None, name)
         return res
@@ -982,14 +1034,16 @@ class SlangProgramLayout:
         existing = self._functions_by_name.get(qualified_name)
         if existing is not None:
             return existing
+        if qualified_name in self._missing_functions:
+            return None
         type_refl = self.program_layout.find_type_by_name(type.full_name)
         if type_refl is None:
             raise ValueError(f"Type {type.full_name} not found")
         func_refl = self.program_layout.find_function_by_name_in_type(type_refl, name)
         if func_refl is None:
+            self._missing_functions.add(qualified_name)
             return None
-        res = self._get_or_create_function(
-            self.program_layout.find_function_by_name_in_type(type_refl, name), self._get_or_create_type(type_refl), name)
+        res = self._get_or_create_function(func_refl, self._get_or_create_type(type_refl), name)
         return res
 
     def require_function_by_name_in_type(self, type: SlangType, name: str) -> SlangFunction:
@@ -1051,18 +1105,10 @@ class SlangProgramLayout:
         return res
 
     def _reflect_type(self, refl: TypeReflection):
-        if refl.kind == TR.Kind.scalar:
-            return self._reflect_scalar(refl)
-        elif refl.kind == TR.Kind.vector:
-            return self._reflect_vector(refl)
-        elif refl.kind == TR.Kind.matrix:
-            return self._reflect_matrix(refl)
-        elif refl.kind == TR.Kind.array:
-            return self._reflect_array(refl)
-        elif refl.kind == TR.Kind.resource:
-            return self._reflect_resource(refl)
-        elif refl.kind == TR.Kind.sampler_state:
-            return SamplerStateType(self, refl)
+        kind = refl.kind
+        reflector = _FUNDAMENTAL_TYPE_REFLECTORS.get(kind)
+        if reflector is not None:
+            return getattr(self, reflector)(refl)
 
         # It's not any of the fundamental types. Check if a custom handler was defined,
         # giving precedence to handlers that match the fully specialized name
@@ -1073,9 +1119,9 @@ class SlangProgramLayout:
             return handler(self, refl)
 
         # Catch the remaining types
-        if refl.kind == TR.Kind.struct:
+        if kind == TR.Kind.struct:
             return StructType(self, refl)
-        elif refl.kind == TR.Kind.interface:
+        elif kind == TR.Kind.interface:
             return InterfaceType(self, refl)
         else:
             # This type is not represented by its own class - just store the basic info
@@ -1108,6 +1154,9 @@ class SlangProgramLayout:
         else:
             return ResourceType(self, refl)
 
+    def _reflect_sampler_state(self, refl: TypeReflection) -> SlangType:
+        return SamplerStateType(self, refl)
+
     def _reflect_function(self, function: FunctionReflection, this: Optional[SlangType], full_name: Optional[str]) -> SlangFunction:
         return SlangFunction(self, function, this, full_name)
 
@@ -1176,6 +1225,18 @@ def can_convert_to_int(value: Any):
 
 TGenericArgs = Optional[tuple[Union[int, SlangType], ...]]
 
+#: Name of the SlangProgramLayout method that reflects each fundamental type kind,
+#: looked up before any type overrides. Methods are found by name so that
+#: subclasses can override them.
+_FUNDAMENTAL_TYPE_REFLECTORS: dict[TR.Kind, str] = {
+    TR.Kind.scalar: '_reflect_scalar',
+    TR.Kind.vector: '_reflect_vector',
+    TR.Kind.matrix: '_reflect_matrix',
+    TR.Kind.array: '_reflect_array',
+    TR.Kind.resource: '_reflect_resource',
+    TR.Kind.sampler_state: '_reflect_sampler_state',
+}
+
 #: Mapping from a type name to a callable that creates a SlangType from a TypeReflection.
 #: This can be used to extend the type system and wrap custom types in their own reflection types.
 TYPE_OVERRIDES: dict[str, Callable[[
@@ -12,7 +12,7 @@ from slangpy.core.calldata import SLANG_PATH
 
 import slangpy
 from slangpy import Module
-from slangpy.backend import (Device, DeviceType, SlangCompilerOptions,
+from slangpy.backend import (ComputeKernel, Device, DeviceType, SlangCompilerOptions,
                              SlangDebugInfoLevel)
 
 SHADER_DIR = Path(__file__).parent
@@ -30,6 +30,8 @@ else:
 
 DEVICE_CACHE: dict[tuple[DeviceType, bool], Device] = {}
 
+KERNEL_CACHE: dict[tuple[Device, str, tuple[str, ...]], ComputeKernel] = {}
+
 # Enable this to make tests just run on d3d12 for faster testing
 # DEFAULT_DEVICE_TYPES = [DeviceType.d3d12]
 
@@ -66,6 +68,18 @@ def get_device(type: DeviceType, use_cache: bool = True, cuda_interop: bool = Fa
         DEVICE_CACHE[cache_key] = device
     return device
 
+# Helper that loads a program from a shader file and creates a compute kernel for it,
+# caching kernels per device so repeated loads of the same file skip compilation.
+
+
+def load_compute_kernel(device: Device, path: str, entry_points: list[str]) -> ComputeKernel:
+    cache_key = (device, path, tuple(entry_points))
+    kernel = KERNEL_CACHE.get(cache_key)
+    if kernel is None:
+        kernel = device.create_compute_kernel(device.load_program(path, entry_points))
+        KERNEL_CACHE[cache_key] = kernel
+    return kernel
+
 # Helper that creates a module from source (if not already loaded) and returns
 # the corresponding slangpy module.
 
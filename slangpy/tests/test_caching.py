@@ -4,7 +4,10 @@ from typing import Any
 import pytest
 
 import slangpy.tests.helpers as helpers
-from slangpy.backend import DeviceType
+from slangpy.backend import DeviceType, float3, float3x3
+from slangpy.bindings import get_or_create_type
+from slangpy.core.module import CallDataCache
+from slangpy.core.native import SignatureBuilder
 from slangpy.types.buffer import NDBuffer
 
 BASE_MODULE = r"""
@@ -57,5 +60,82 @@ def test_share_kernel_with_same_mapping(device_type: DeviceType):
     assert float_float_cd.kernel == mapped_float_float_cd.kernel
 
 
+@pytest.mark.parametrize("device_type", helpers.DEFAULT_DEVICE_TYPES)
+def test_precompile_populates_kernel_cache(device_type: DeviceType):
+    m = load_test_module(device_type)
+    assert m is not None
+
+    func = m.foo.as_func()
+
+    func.precompile(((1.0, 2.0), {}), ((1, 2), {}), ((1.0, 2.0), {}))
+    num_kernels = len(m.kernel_cache)
+    assert num_kernels >= 2
+
+    # Calls with precompiled argument types reuse the compiled kernels.
+    float_float_cd = func.debug_build_call_data(1.0, 2.0)
+    int_int_cd = func.debug_build_call_data(1, 2)
+    assert len(m.kernel_cache) == num_kernels
+    assert float_float_cd.kernel in m.kernel_cache.values()
+    assert int_int_cd.kernel in m.kernel_cache.values()
+
+
+@pytest.mark.parametrize("device_type", helpers.DEFAULT_DEVICE_TYPES)
+def test_clear_call_data_cache(device_type: DeviceType):
+    m = load_test_module(device_type)
+    assert m is not None
+
+    func = m.foo.as_func()
+
+    cd = func.debug_build_call_data(1.0, 2.0)
+    assert func.debug_build_call_data(1.0, 2.0) == cd
+
+    m.clear_call_data_cache()
+    assert len(m.kernel_cache) == 0
+
+    new_cd = func.debug_build_call_data(1.0, 2.0)
+    assert new_cd != cd
+    assert len(m.kernel_cache) == 1
+
+
+@pytest.mark.parametrize("device_type", helpers.DEFAULT_DEVICE_TYPES)
+def test_value_marshalls_shared_per_layout(device_type: DeviceType):
+    m = load_test_module(device_type)
+    assert m is not None
+
+    float_marshall = get_or_create_type(m.layout, float, 1.0)
+    assert get_or_create_type(m.layout, float, 2.0) is float_marshall
+    assert get_or_create_type(m.layout, int, 1) is not float_marshall
+
+    # Shared marshalls live on the layout rather than in a global registry.
+    assert float_marshall in m.layout._shared_marshalls.values()
+
+
+def test_unregistered_types_with_same_name_have_distinct_signatures():
+    def make_a():
+        class Foo:
+            pass
+        return Foo()
+
+    def make_b():
+        class Foo:
+            pass
+        return Foo()
+
+    cache = CallDataCache()
+    signatures = []
+    for value in (make_a(), make_b()):
+        builder = SignatureBuilder()
+        cache.get_value_signature(builder, value)
+        signatures.append(builder.str)
+    assert signatures[0] != signatures[1]
+
+
+def test_registered_types_without_signature_add_nothing():
+    cache = CallDataCache()
+    assert cache.lookup_value_signature(1.0) is None
+    assert cache.lookup_value_signature(float3(1, 2, 3)) is None
+    assert cache.lookup_value_signature(float3x3()) is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
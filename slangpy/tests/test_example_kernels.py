@@ -20,6 +20,15 @@ def rand_array_of_floats(size: int):
     return np.random.rand(size).astype(np.float32)
 
 
+def read_soa_as_aos(*buffers: NDDifferentiableBuffer, grad: bool = False):
+    # Read per-component float1 buffers back into a single (count, components) array.
+    result = np.empty((buffers[0].element_count, len(buffers)), dtype=np.float32)
+    for i, buffer in enumerate(buffers):
+        storage = buffer.grad.storage if grad else buffer.storage
+        result[:, i] = storage.to_numpy().view(np.float32)
+    return result
+
+
 @pytest.mark.skip(reason="Test for slang issue")
 @pytest.mark.parametrize("device_type", helpers.DEFAULT_DEVICE_TYPES)
 def test_read_slice_error(test_id: str, device_type: DeviceType):
@@ -72,27 +81,30 @@ void user_func(float a, float b, out float c) {
         element_count=64, device=device, element_type=float, requires_grad=True
     )
     in_buffer_0.storage.copy_from_numpy(rand_array_of_floats(in_buffer_0.element_count))
-    in_buffer_0.grad.storage.copy_from_numpy(
-        np.zeros(in_buffer_0.element_count, dtype=np.float32))
 
     # Same with input buffer 1.
     in_buffer_1 = NDDifferentiableBuffer(
         element_count=64, device=device, element_type=float, requires_grad=True
     )
     in_buffer_1.storage.copy_from_numpy(rand_array_of_floats(in_buffer_1.element_count))
-    in_buffer_1.grad.storage.copy_from_numpy(
-        np.zeros(in_buffer_1.element_count, dtype=np.float32))
 
     # Create empty output buffer with gradients initialized to 1 (as there is 1-1 correspondence between
     # output of user function and output of kernel)
     out_buffer = NDDifferentiableBuffer(
         element_count=64, device=device, element_type=float, requires_grad=True
     )
-    out_buffer.storage.copy_from_numpy(np.zeros(out_buffer.element_count, dtype=np.float32))
     out_buffer.grad.storage.copy_from_numpy(
         np.ones(out_buffer.element_count, dtype=np.float32))
 
-    # Dispatch the forward kernel.
+    # Record the zeroing of the input gradients and output, followed by the forward and
+    # backward kernels, into one command buffer and submit once. Explicit barriers make
+    # each pass see the previous one's writes.
+    command_buffer = device.create_command_buffer()
+    in_buffer_0.clear_grad(command_buffer)
+    in_buffer_1.clear_grad(command_buffer)
+    out_buffer.clear(command_buffer)
+    for cleared in (in_buffer_0.grad.storage, in_buffer_1.grad.storage, out_buffer.storage):
+        command_buffer.uav_barrier(cleared)
     kernel.dispatch(
         uint3(64, 1, 1),
         {
@@ -102,16 +114,9 @@ void user_func(float a, float b, out float c) {
                 "c": out_buffer.storage,
             }
         },
+        command_buffer=command_buffer,
     )
-
-    # Read and validate forward kernel results (expecting c = a*a + b + 1)
-    in_data_0 = in_buffer_0.storage.to_numpy().view(np.float32)
-    in_data_1 = in_buffer_1.storage.to_numpy().view(np.float32)
-    out_data = out_buffer.storage.to_numpy().view(np.float32)
-    eval_data = in_data_0 * in_data_0 + in_data_1 + 1
-    assert np.allclose(out_data, eval_data)
-
-    # Dispatch the backward kernel.
+    command_buffer.uav_barrier(out_buffer.storage)
     backwards_kernel.dispatch(
         uint3(64, 1, 1),
         {
@@ -124,7 +129,16 @@ void user_func(float a, float b, out float c) {
                 "c_grad": out_buffer.grad.storage,
             }
         },
+        command_buffer=command_buffer,
     )
+    command_buffer.submit()
+
+    # Read and validate forward kernel results (expecting c = a*a + b + 1)
+    in_data_0 = in_buffer_0.storage.to_numpy().view(np.float32)
+    in_data_1 = in_buffer_1.storage.to_numpy().view(np.float32)
+    out_data = out_buffer.storage.to_numpy().view(np.float32)
+    eval_data = in_data_0 * in_data_0 + in_data_1 + 1
+    assert np.allclose(out_data, eval_data)
 
     # Read and validate backward kernel results (expecting a_grad = 2*a, b_grad = 1)
     in_grad_0 = in_buffer_0.grad.storage.to_numpy().view(np.float32)
@@ -141,13 +155,11 @@ def test_vec3_call_with_buffers_soa(device_type: DeviceType):
 
     device = helpers.get_device(device_type)
 
-    prim_program = device.load_program(
-        str(Path(__file__).parent / "generated_tests/polynomial_soa.slang"), ["main"])
-    kernel_eval_polynomial = device.create_compute_kernel(prim_program)
+    kernel_eval_polynomial = helpers.load_compute_kernel(
+        device, str(Path(__file__).parent / "generated_tests/polynomial_soa.slang"), ["main"])
 
-    bwds_program = device.load_program(
-        str(Path(__file__).parent / "generated_tests/polynomial_soa_backwards.slang"), ["main"])
-    kernel_eval_polynomial_backwards = device.create_compute_kernel(bwds_program)
+    kernel_eval_polynomial_backwards = helpers.load_compute_kernel(
+        device, str(Path(__file__).parent / "generated_tests/polynomial_soa_backwards.slang"), ["main"])
 
     a_x = NDDifferentiableBuffer(
         element_count=32,
@@ -201,21 +213,13 @@ def test_vec3_call_with_buffers_soa(device_type: DeviceType):
         '_thread_count': uint3(total_threads, 1, 1)
     }
 
-    # Dispatch the kernel.
-    kernel_eval_polynomial.dispatch(uint3(total_threads, 1, 1), {"call_data": call_data})
-
-    a_x_data = a_x.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_y_data = a_y.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_z_data = a_z.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_data = np.column_stack((a_x_data, a_y_data, a_z_data))
-    b_data = b.storage.to_numpy().view(np.float32).reshape(-1, 3)
-    expected = python_eval_polynomial(a_data, b_data)
-    res_data = res.storage.to_numpy().view(np.float32).reshape(-1, 3)
-
-    assert np.allclose(res_data, expected)
-
     res.grad.storage.copy_from_numpy(np.ones(32*3, dtype=np.float32))
 
+    # Record the forward and backward kernels into one command buffer and submit once.
+    command_buffer = device.create_command_buffer()
+    kernel_eval_polynomial.dispatch(
+        uint3(total_threads, 1, 1), {"call_data": call_data}, command_buffer=command_buffer)
+
     call_data = {
         'a__x_primal': {'buffer': a_x.storage, 'strides': list(a_x.strides)},
         'a__x_derivative': {'buffer': a_x.grad.storage, 'strides': list(a_x.strides)},
@@ -232,12 +236,17 @@ def test_vec3_call_with_buffers_soa(device_type: DeviceType):
     }
 
     kernel_eval_polynomial_backwards.dispatch(
-        uint3(total_threads, 1, 1), {"call_data": call_data})
+        uint3(total_threads, 1, 1), {"call_data": call_data}, command_buffer=command_buffer)
+    command_buffer.submit()
+
+    a_data = read_soa_as_aos(a_x, a_y, a_z)
+    b_data = b.storage.to_numpy().view(np.float32).reshape(-1, 3)
+    expected = python_eval_polynomial(a_data, b_data)
+    res_data = res.storage.to_numpy().view(np.float32).reshape(-1, 3)
 
-    a_x_grad_data = a_x.grad.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_y_grad_data = a_y.grad.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_z_grad_data = a_z.grad.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_grad_data = np.column_stack((a_x_grad_data, a_y_grad_data, a_z_grad_data))
+    assert np.allclose(res_data, expected)
+
+    a_grad_data = read_soa_as_aos(a_x, a_y, a_z, grad=True)
     b_grad_data = b.grad.storage.to_numpy().view(np.float32).reshape(-1, 3)
 
     exprected_grad = python_eval_polynomial_a_deriv(a_data, b_data)
@@ -253,9 +262,8 @@ def test_vec3_nested_calldata_soa(device_type: DeviceType):
 
     device = helpers.get_device(device_type)
 
-    prim_program = device.load_program(
-        str(Path(__file__).parent / "nested_types.slang"), ["main"])
-    kernel_eval_polynomial = device.create_compute_kernel(prim_program)
+    kernel_eval_polynomial = helpers.load_compute_kernel(
+        device, str(Path(__file__).parent / "nested_types.slang"), ["main"])
 
     a_x = NDDifferentiableBuffer(
         element_count=32,
@@ -314,10 +322,7 @@ def test_vec3_nested_calldata_soa(device_type: DeviceType):
     # Dispatch the kernel.
     kernel_eval_polynomial.dispatch(uint3(total_threads, 1, 1), {"call_data": call_data})
 
-    a_x_data = a_x.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_y_data = a_y.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_z_data = a_z.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_data = np.column_stack((a_x_data, a_y_data, a_z_data))
+    a_data = read_soa_as_aos(a_x, a_y, a_z)
     b_data = b.storage.to_numpy().view(np.float32).reshape(-1, 3)
     expected = python_eval_polynomial(a_data, b_data)
     res_data = res.storage.to_numpy().view(np.float32).reshape(-1, 3)
@@ -330,9 +335,8 @@ def test_vec3_nested_calldata_soa_generics(device_type: DeviceType):
 
     device = helpers.get_device(device_type)
 
-    prim_program = device.load_program(
-        str(Path(__file__).parent / "nested_types_generics.slang"), ["main"])
-    kernel_eval_polynomial = device.create_compute_kernel(prim_program)
+    kernel_eval_polynomial = helpers.load_compute_kernel(
+        device, str(Path(__file__).parent / "nested_types_generics.slang"), ["main"])
 
     a_x = NDDifferentiableBuffer(
         element_count=32,
@@ -391,10 +395,7 @@ def test_vec3_nested_calldata_soa_generics(device_type: DeviceType):
     # Dispatch the kernel.
     kernel_eval_polynomial.dispatch(uint3(total_threads, 1, 1), {"call_data": call_data})
 
-    a_x_data = a_x.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_y_data = a_y.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_z_data = a_z.storage.to_numpy().view(np.float32).reshape(-1, 1)
-    a_data = np.column_stack((a_x_data, a_y_data, a_z_data))
+    a_data = read_soa_as_aos(a_x, a_y, a_z)
     b_data = b.storage.to_numpy().view(np.float32).reshape(-1, 3)
     expected = python_eval_polynomial(a_data, b_data)
     res_data = res.storage.to_numpy().view(np.float32).reshape(-1, 3)
@@ -102,6 +102,18 @@ def test_dispatch_ndbuffer_func(device_type: DeviceType):
     assert np.all(data == expected)
 
 
+@pytest.mark.parametrize("device_type", helpers.DEFAULT_DEVICE_TYPES)
+def test_dispatch_multiple_funcs_same_module(device_type: DeviceType):
+    mod = load_test_module(device_type)
+    buffer = NDBuffer(mod.device, mod.uint3, 32)
+    mod.ndbuffer_threadparam.dispatch(uint3(32, 1, 1), buffer=buffer)
+    mod.ndbuffer_multiply.dispatch(uint3(32, 1, 1), buffer=buffer, amount=3)
+    data = buffer.to_numpy().view(np.uint32).reshape(-1, 3)
+    expected = np.array([[i*3, 0, 0] for i in range(32)])
+    assert np.all(data == expected)
+    assert len(mod.dispatch_data_cache) == 2
+
+
 @pytest.mark.parametrize("device_type", helpers.DEFAULT_DEVICE_TYPES)
 def test_override_threadgroup(device_type: DeviceType):
     mod = load_test_module(device_type)
@@ -1,6 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
-from slangpy.bindings import (PYTHON_TYPES, AccessType, Marshall, BindContext,
+from slangpy.bindings import (PYTHON_TYPES, AccessType, get_or_create_shared_marshall, Marshall, BindContext,
                               BoundVariable,
                               CodeGenBlock, Shape)
 from slangpy.experimental.gridarg import grid
@@ -69,4 +69,4 @@ class CallIdArgMarshall(Marshall):
         return -1
 
 
-PYTHON_TYPES[CallIdArg] = lambda l, x: CallIdArgMarshall(l, x.dims)
+PYTHON_TYPES[CallIdArg] = lambda l, x: get_or_create_shared_marshall(l, CallIdArgMarshall, x.dims)
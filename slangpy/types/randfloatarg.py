@@ -1,7 +1,7 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 from typing import Any
 
-from slangpy.bindings import (PYTHON_TYPES, AccessType, Marshall, BindContext,
+from slangpy.bindings import (PYTHON_TYPES, AccessType, get_or_create_shared_marshall, Marshall, BindContext,
                               BoundVariable, BoundVariableRuntime, CallContext,
                               CodeGenBlock, Shape)
 from slangpy.reflection import SlangProgramLayout, SlangType, TypeReflection
@@ -87,4 +87,4 @@ class RandFloatArgMarshall(Marshall):
         return 0
 
 
-PYTHON_TYPES[RandFloatArg] = lambda l, x: RandFloatArgMarshall(l, x.dims, x.warmup)
+PYTHON_TYPES[RandFloatArg] = lambda l, x: get_or_create_shared_marshall(l, RandFloatArgMarshall, x.dims, x.warmup)
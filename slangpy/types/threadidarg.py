@@ -1,6 +1,6 @@
 # SPDX-License-Identifier: Apache-2.0 WITH LLVM-exception
 
-from slangpy.bindings import (PYTHON_TYPES, AccessType, Marshall, BindContext,
+from slangpy.bindings import (PYTHON_TYPES, AccessType, get_or_create_shared_marshall, Marshall, BindContext,
                               BoundVariable,
                               CodeGenBlock, Shape)
 from slangpy.core.utils import is_type_castable_on_host
@@ -57,4 +57,4 @@ class ThreadIdArgMarshall(Marshall):
         return 0
 
 
-PYTHON_TYPES[ThreadIdArg] = lambda l, x: ThreadIdArgMarshall(l, x.dims)
+PYTHON_TYPES[ThreadIdArg] = lambda l, x: get_or_create_shared_marshall(l, ThreadIdArgMarshall, x.dims)
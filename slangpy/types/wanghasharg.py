@@ -4,7 +4,7 @@ from typing import Any
 import numpy as np
 import numpy.typing as npt
 
-from slangpy.bindings import (PYTHON_TYPES, AccessType, Marshall, BindContext,
+from slangpy.bindings import (PYTHON_TYPES, AccessType, get_or_create_shared_marshall, Marshall, BindContext,
                               BoundVariable, BoundVariableRuntime, CallContext,
                               CodeGenBlock, Shape)
 from slangpy.reflection import SlangProgramLayout, SlangType, TypeReflection
@@ -100,4 +100,4 @@ class WangHashArgMarshall(Marshall):
         return 0
 
 
-PYTHON_TYPES[WangHashArg] = lambda l, x: WangHashArgMarshall(l, x.dims, x.warmup)
+PYTHON_TYPES[WangHashArg] = lambda l, x: get_or_create_shared_marshall(l, WangHashArgMarshall, x.dims, x.warmup)